@@ -88,10 +88,11 @@ class ChronoApp():
                 # Skip the update
                 return
 
-        # Undraw old time
-        hh = (30 * (self._hh % 12)) + (self._mm / 2)
+        # Undraw old time (the hour hand angle is in half degrees, which
+        # keeps polar_half() free of floating point)
+        hh = (60 * (self._hh % 12)) + self._mm
         mm = 6 * self._mm
-        draw.polar(120, 120, hh, 5, 75, 7, 0)
+        draw.polar_half(120, 120, hh, 5, 75, 7, 0)
         draw.polar(120, 120, mm, 5, 106, 5, 0)
 
         # Record the minute that is currently being displayed
@@ -99,8 +100,8 @@ class ChronoApp():
         self._mm = now[4]
 
         # Draw the new time
-        hh = (30 * (self._hh % 12)) + (self._mm / 2)
+        hh = (60 * (self._hh % 12)) + self._mm
         mm = 6 * self._mm
-        draw.polar(120, 120, hh, 5, 75, 7, hi)
-        draw.polar(120, 120, hh, 5, 60, 3, draw.darken(c1, 2))
+        draw.polar_half(120, 120, hh, 5, 75, 7, hi)
+        draw.polar_half(120, 120, hh, 5, 60, 3, draw.darken(c1, 2))
         draw.polar(120, 120, mm, 5, 106, 5, hi)
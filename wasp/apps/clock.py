@@ -55,6 +55,33 @@ class ClockApp():
         """
         self._draw()
 
+    def ambient(self):
+        """Draw the always-on display.
+
+        Only the hours and minutes remain visible whilst the watch is
+        asleep. The date is left untouched and will be redrawn by the
+        (lazy) update in :py:meth:`~.wake` if it has changed.
+
+        :returns: The rows, as (y, h), that must be kept visible
+        """
+        draw = wasp.watch.drawable
+        hi =  wasp.system.theme('bright')
+        lo =  wasp.system.theme('mid')
+        now = wasp.watch.rtc.get_localtime()
+
+        draw.begin()
+        try:
+            draw.blit(DIGITS[now[4]  % 10], 4*48, 80, fg=hi)
+            draw.blit(DIGITS[now[4] // 10], 3*48, 80, fg=lo)
+            draw.blit(DIGITS[now[3]  % 10], 1*48, 80, fg=hi)
+            draw.blit(DIGITS[now[3] // 10], 0*48, 80, fg=lo)
+        finally:
+            draw.end()
+
+        # Forget the minute on display to force the next update to redraw
+        self._min = None
+        return (80, 60)
+
     def tick(self, ticks):
         """Periodic callback to update the display."""
         self._draw()
@@ -76,37 +103,44 @@ class ClockApp():
         lo =  wasp.system.theme('mid')
         mid = draw.lighten(lo, 1)
 
-        if redraw:
-            now = wasp.watch.rtc.get_localtime()
-
-            # Clear the display and draw that static parts of the watch face
-            draw.fill()
-            draw.blit(digits.clock_colon, 2*48, 80, fg=mid)
-
-            # Redraw the status bar
-            wasp.system.bar.draw()
-        else:
-            # The update is doubly lazy... we update the status bar and if
-            # the status bus update reports a change in the time of day 
-            # then we compare the minute on display to make sure we 
-            # only update the main clock once per minute.
-            now = wasp.system.bar.update()
-            if not now or self._min == now[4]:
-                # Skip the update
-                return
-
-        # Format the month as text
-        month = now[1] - 1
-        month = MONTH[month*3:(month+1)*3]
-
-        # Draw the changeable parts of the watch face
-        draw.blit(DIGITS[now[4]  % 10], 4*48, 80, fg=hi)
-        draw.blit(DIGITS[now[4] // 10], 3*48, 80, fg=lo)
-        draw.blit(DIGITS[now[3]  % 10], 1*48, 80, fg=hi)
-        draw.blit(DIGITS[now[3] // 10], 0*48, 80, fg=lo)
-        draw.set_color(hi)
-        draw.string('{} {} {}'.format(now[2], month, now[0]),
-                0, 180, width=240)
-
-        # Record the minute that is currently being displayed
-        self._min = now[4]
+        # Collect the updates so they reach the display in as few
+        # transactions as possible
+        draw.begin()
+        try:
+            if redraw:
+                now = wasp.watch.rtc.get_localtime()
+
+                # Clear the display and draw that static parts of the watch
+                # face
+                draw.fill()
+                draw.blit(digits.clock_colon, 2*48, 80, fg=mid)
+
+                # Redraw the status bar
+                wasp.system.bar.draw()
+            else:
+                # The update is doubly lazy... we update the status bar and if
+                # the status bus update reports a change in the time of day 
+                # then we compare the minute on display to make sure we 
+                # only update the main clock once per minute.
+                now = wasp.system.bar.update()
+                if not now or self._min == now[4]:
+                    # Skip the update
+                    return
+
+            # Format the month as text
+            month = now[1] - 1
+            month = MONTH[month*3:(month+1)*3]
+
+            # Draw the changeable parts of the watch face
+            draw.blit(DIGITS[now[4]  % 10], 4*48, 80, fg=hi)
+            draw.blit(DIGITS[now[4] // 10], 3*48, 80, fg=lo)
+            draw.blit(DIGITS[now[3]  % 10], 1*48, 80, fg=hi)
+            draw.blit(DIGITS[now[3] // 10], 0*48, 80, fg=lo)
+            draw.set_color(hi)
+            draw.string('{} {} {}'.format(now[2], month, now[0]),
+                    0, 180, width=240)
+
+            # Record the minute that is currently being displayed
+            self._min = now[4]
+        finally:
+            draw.end()
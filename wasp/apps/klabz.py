@@ -12,7 +12,7 @@ Shows the time as a traditional watch face together with a battery meter.
     Screenshot of the custom watchface
 """
 
-import math
+import draw565
 import wasp
 import micropython
 import fonts.sans36 as sans36
@@ -20,8 +20,6 @@ import fonts.sans28 as sans28
 import fonts.sans24 as sans24
 import fonts.sans18 as sans18
 
-from draw565 import _fill
-
 # 2-bit RLE, 18x16, generated from res/watch-heart.png, 250 bytes
 icon_heart = (
     b'\x02'
@@ -144,6 +142,28 @@ class KLabzApp():
         """
         self._draw()
 
+    def ambient(self):
+        """Draw the always-on display.
+
+        Only the hours and minutes remain visible whilst the watch is
+        asleep (the seconds are cleared and will be redrawn on wake).
+
+        :returns: The rows, as (y, h), that must be kept visible
+        """
+        draw = wasp.watch.drawable
+        now = wasp.watch.rtc.get_localtime()
+
+        draw.set_color(wasp.system.theme('bright'))
+        draw.set_font(sans36)
+        draw.string('{:02d}'.format(now[3]), 18, 91, 72)
+        draw.string('{:02d}'.format(now[4]), 98, 91, 72)
+        draw.fill(0, 167, 99, 56, 28)
+
+        self.__hh = now[3]
+        self.__mm = now[4]
+        self.__ss = -1
+        return (91, 36)
+
     def tick(self, ticks):
         """Periodic callback to update the display."""
         self._draw()
@@ -213,50 +233,14 @@ class KLabzApp():
             self.__hr = -2
 
         if self.__battery != battery:
-            # Optimized way of drawing the triangles
-            display = draw._display
-
-            # Top "half" -- part with date
-            display.set_window(210, 0, 30, 26)
-            display.quick_start()
-            for i in range(0, 26):
-                buf = display.linebuffer
-                bg_len = math.floor((i*240) / 214)
-                bg_pos = 30 - bg_len
-                bar_len = math.floor((i*battery) / 214)
-                _fill(buf, 0, bg_pos, 0)
-                _fill(buf, mid, bar_len, bg_pos)
-                _fill(buf, ui, bg_len - bar_len, bg_pos + bar_len)
-                display.quick_write(buf[0:30*2])
-            display.quick_end()
-
-            # Top "half" -- rest
-            display.set_window(80, 26, 160, 82 - 26)
-            display.quick_start()
-            for i in range(0, 82 - 26):
-                buf = display.linebuffer
-                bg_len = math.floor(((i+26)*240) / 214)
-                bg_pos = 160 - bg_len
-                bar_len = math.floor(((i+26)*battery) / 214)
-                _fill(buf, 0, bg_pos, 0)
-                _fill(buf, mid, bar_len, bg_pos)
-                _fill(buf, ui, bg_len - bar_len, bg_pos + bar_len)
-                display.quick_write(buf[0:160*2])
-            display.quick_end()
-
-            # Bottom "half"
-            display.set_window(0, 136, 240, 214 - 136)
-            display.quick_start()
-            for i in range(0, 214 - 136):
-                buf = display.linebuffer
-                bg_len = math.floor(((i+136)*240) / 214)
-                bg_pos = 240 - bg_len
-                bar_len = math.floor(((i+136)*battery) / 214)
-                _fill(buf, 0, bg_pos, 0)
-                _fill(buf, mid, bar_len, bg_pos)
-                _fill(buf, ui, bg_len - bar_len, bg_pos + bar_len)
-                display.quick_write(buf[0:240*2])
-            display.quick_end()
+            # The gauge is a triangle split into two at the battery level.
+            # It is drawn in three parts to avoid overwriting the clock.
+            gauge = ((draw565.POLYGON, mid, ((240, 0), (0, 214), (battery, 214))),
+                     (draw565.POLYGON, ui, ((240, 0), (battery, 214), (240, 214))))
+            draw.set_color(ui)
+            draw.shapes(gauge, 210, 0, 30, 26)
+            draw.shapes(gauge, 80, 26, 160, 82 - 26)
+            draw.shapes(gauge, 0, 136, 240, 214 - 136)
 
             if battery < 194:
                 draw.set_color(mid, ui)
@@ -10,27 +10,46 @@ information when applications crash.
 """
 
 import wasp
+import draw565
 import icons
 
 import io
 import sys
 
+from micropython import const
+
+# Lines of text that fit in the scrolling area (with 72 hidden rows)
+_SLOTS = const(13)
+
 class PagerApp():
-    """Show a long text message in a pager."""
+    """Show a long text message in a pager.
+
+    The pager uses the hardware scrolling of the display. The frame memory
+    is treated as a ring of 13 lines of text, 10 of which are visible, so
+    moving to the next page only needs the newly exposed lines to be drawn.
+    """
     NAME = 'Pager'
     ICON = icons.app
 
     def __init__(self, msg):
         self._msg = msg
-        self._scroll = wasp.widgets.ScrollIndicator()
 
     def foreground(self):
         """Activate the application."""
+        wasp.watch.display.set_scroll_area(0, 24 * _SLOTS, 320 - 24 * _SLOTS)
         wasp.system.request_event(wasp.EventMask.SWIPE_UPDOWN)
         self._redraw()
 
     def background(self):
-        """De-activate the application."""
+        """De-activate the application.
+
+        Conceal the display before scrolling back to the top of the frame
+        memory otherwise the user sees the page jump as we leave.
+        """
+        display = wasp.watch.display
+        display.mute(True)
+        display.scroll(0)
+        display.set_scroll_area()
         self._chunks = None
         self._numpages = None
 
@@ -40,13 +59,12 @@ class PagerApp():
             if self._page >= self._numpages:
                 wasp.system.navigate(wasp.EventType.BACK)
                 return
-            self._page += 1
+            self._scroll(self._page + 1)
         else:
             if self._page <= 0:
                 wasp.watch.vibrator.pulse()
                 return
-            self._page -= 1
-        self._draw()
+            self._scroll(self._page - 1)
 
     def _redraw(self):
         """Redraw from scratch (jump to the first page)"""
@@ -57,28 +75,74 @@ class PagerApp():
 
     def _draw(self):
         """Draw a page from scratch."""
-        mute = wasp.watch.display.mute
+        display = wasp.watch.display
         draw = wasp.watch.drawable
 
-        mute(True)
+        display.mute(True)
         draw.set_color(0xffff)
-        draw.fill()
 
+        top = self._page * 9
+        display.scroll(24 * (top % _SLOTS))
+        for n in range(top, top + 10):
+            self._line(n)
+        self._draw_scroll()
+
+        display.mute(False)
+
+    def _scroll(self, page):
+        """Scroll, one line at a time, to the start of a new page."""
+        display = wasp.watch.display
+        draw = wasp.watch.drawable
+        draw.set_color(0xffff)
+
+        top = self._page * 9
+        self._page = page
+        if page * 9 > top:
+            while top < page * 9:
+                self._line(top + 10)
+                top += 1
+                display.scroll(24 * (top % _SLOTS))
+
+            # The scroll indicator has scrolled to the top right corner
+            # (over the new first line) so repair the text beneath it
+            tile = draw565.Canvas(draw, bytearray(2 * 18 * 24), 18, 24)
+            tile.set_color(0xffff)
+            self._line(top, tile, -222, 0)
+            tile.flush(222, 24 * (top % _SLOTS))
+        else:
+            while top > page * 9:
+                top -= 1
+                self._line(top)
+                display.scroll(24 * (top % _SLOTS))
+
+        self._draw_scroll()
+
+    def _line(self, n, draw=None, x=0, y=None):
+        """Draw line n of the message into its slot in the frame memory."""
+        if not draw:
+            draw = wasp.watch.drawable
+        if y is None:
+            y = 24 * (n % _SLOTS)
+
+        chunks = self._chunks
+        w = 0
+        if n + 1 < len(chunks):
+            sub = self._msg[chunks[n]:chunks[n+1]].rstrip()
+            if sub:
+                draw.string(sub, x, y)
+                w = draw.bounding_box(sub)[0]
+        if w < 240:
+            draw.fill(None, x + w, y, 240 - w, 24)
+
+    def _draw_scroll(self):
+        """Draw the scroll indicator over the last line of the page."""
         page = self._page
-        i = page * 9
-        j = i + 11
-        chunks = self._chunks[i:j]
-        for i in range(len(chunks)-1):
-            sub = self._msg[chunks[i]:chunks[i+1]].rstrip()
-            draw.string(sub, 0, 24*i)
-
-        scroll = self._scroll
+        scroll = wasp.widgets.ScrollIndicator(
+                y=24 * ((page * 9 + 9) % _SLOTS))
         scroll.up = page > 0
         scroll.down = page < self._numpages
         scroll.draw()
 
-        mute(False)
-
 class NotificationApp(PagerApp):
     NAME = 'Notifications'
 
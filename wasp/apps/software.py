@@ -42,6 +42,12 @@ icon = (
     b'\x08\x8a\x08J?\xff\x0b'
 )
 
+def _class_name(app):
+    """Get the class name of an application (even if it is not loaded)."""
+    if isinstance(app, wasp.LazyApp):
+        return app.cls_name
+    return type(app).__name__
+
 class SoftwareApp():
     """Enable and disable applications."""
     NAME = 'Apps'
@@ -95,7 +101,7 @@ class SoftwareApp():
         for _, checkbox in db:
             label = checkbox.label.replace(' ', '')
             for app in wasp.system.launcher_ring:
-                if type(app).__name__.startswith(label):
+                if _class_name(app).startswith(label):
                     checkbox.state = True
                     break
 
@@ -140,10 +146,11 @@ class SoftwareApp():
             if checkbox.touch(event):
                 label = checkbox.label.replace(' ', '')
                 if checkbox.state:
-                    wasp.system.register('apps.{}.{}App'.format(module, label))
+                    wasp.system.register('apps.{}.{}App'.format(module, label),
+                                         lazy=True)
                 else:
                     for app in wasp.system.launcher_ring:
-                        if type(app).__name__.startswith(label):
+                        if _class_name(app).startswith(label):
                             wasp.system.launcher_ring.remove(app)
                             break
                 break
@@ -124,6 +124,10 @@ class TestApp():
         wasp.system.set_alarm(now + 30, nop)
         if not wasp.system.cancel_alarm(now + 30, nop):
             bug()
+        alarm = wasp.system.set_alarm(now + 30, nop)
+        if not wasp.system.cancel_alarm(alarm) or \
+                wasp.system.cancel_alarm(alarm):
+            bug()
         wasp.watch.drawable.string("Done.", 12, 24+80)
 
     def _benchmark_rle(self):
@@ -141,27 +145,44 @@ class TestApp():
 
     def _benchmark_fill(self):
         draw = wasp.watch.drawable
+        display = wasp.watch.display
         draw.fill(0, 0, 30, 240, 240-30)
         self.scroll.draw()
-        t = machine.Timer(id=1, period=8000000)
-        if self.test == 'Fill':
-            t.start()
-            draw.fill(0xffff, 60, 60, 120, 120)
-            elapsed = t.time()
-        elif self.test == 'Fill-H':
-            t.start()
-            for i in range(60, 180, 2):
-                draw.fill(0xffff, 60, i, 120, 1)
-            elapsed = t.time()
-        elif self.test == 'Fill-V':
-            t.start()
-            for i in range(60, 180, 2):
-                draw.fill(0xffff, i, 60, 1, 120)
-            elapsed = t.time()
 
-        t.stop()
-        del t
-        draw.string('{}s'.format(elapsed / 1000000), 12, 24+192)
+        # Run the benchmark using a single line of scratch buffer and then
+        # again using every line the board provides so the two can be
+        # compared.
+        linebuffer = display.linebuffer
+        stride = 2 * display.width
+        sizes = sorted(set((1, len(linebuffer) // stride)))
+        results = []
+        for lines in sizes:
+            display.linebuffer = linebuffer[0:stride*lines]
+            draw.fill(0, 60, 60, 120, 120)
+            t = machine.Timer(id=1, period=8000000)
+            if self.test == 'Fill':
+                t.start()
+                draw.fill(0xffff, 60, 60, 120, 120)
+                elapsed = t.time()
+            elif self.test == 'Fill-H':
+                t.start()
+                for i in range(60, 180, 2):
+                    draw.fill(0xffff, 60, i, 120, 1)
+                elapsed = t.time()
+            elif self.test == 'Fill-V':
+                t.start()
+                for i in range(60, 180, 2):
+                    draw.fill(0xffff, i, 60, 1, 120)
+                elapsed = t.time()
+            t.stop()
+            del t
+            results.append((lines, elapsed))
+        display.linebuffer = linebuffer
+
+        y = 24+192 - 24*(len(results)-1)
+        for (lines, elapsed) in results:
+            draw.string('{}: {}s'.format(lines, elapsed / 1000000), 12, y)
+            y += 24
 
     def _benchmark_string(self):
         draw = wasp.watch.drawable
@@ -245,6 +266,9 @@ class TestApp():
                 draw.string("Now: {}".format(gc.mem_free()), 12, 5*24)
                 gc.collect()
                 draw.string("GC: {}".format(gc.mem_free()), 12, 6*24)
+                policy = wasp.system.gc
+                draw.string("{} GCs {}ms".format(policy.collections,
+                            policy.time_us // 1000), 12, 7*24)
             else:
                 draw.string("Not supported", 12, 4*24)
         elif self.test == 'Notifications':
@@ -37,6 +37,7 @@ manifest = (
     'fonts/sans28.py',
     'fonts/sans36.py',
     'fonts/sans18.py',
+    'gcpolicy.py',
     'icons.py',
     'steplogger.py',
     'widgets.py',
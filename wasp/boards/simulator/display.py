@@ -1,26 +1,51 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 # Copyright (C) 2020 Daniel Thompson
 
-""" Simulated ST7789 display and CST816S touchscreen. """
+""" Simulated ST7789 display and CST816S touchscreen.
+
+By default the display is shown in an SDL window. Set the WASP_SIM_HEADLESS
+environment variable to run without a window (for example in CI or when
+running several simulators at once). The display is then only available as
+the ``framebuffer`` of :py:data:`spi_st7789_sim`, or via
+:py:func:`save_image`, and the touch screen can only be driven
+programmatically.
+"""
 
 import warnings
 warnings.simplefilter("ignore", lineno=58)
 
+import os
 import sys
-import sdl2
-import sdl2.ext
+import time
 import numpy as np
 from PIL import Image
 import wasp
 
+HEADLESS = os.environ.get('WASP_SIM_HEADLESS', '') not in ('', '0')
+if not HEADLESS:
+    import sdl2
+    import sdl2.ext
+
+PTLON = 0x12
+NORON = 0x13
 DISPOFF = 0x28
 DISPON = 0x29
 CASET = 0x2a
 RASET = 0x2b
 RAMWR = 0x2c
+PTLAR = 0x30
+VSCRDEF = 0x33
+VSCSAD = 0x37
+IDMOFF = 0x38
+IDMON = 0x39
+COLMOD = 0x3a
 
 WIDTH = 240
 HEIGHT = 240
+GRAM_HEIGHT = 320
+
+# Writes to the frame memory are shown at (no more than) this rate
+FRAME_RATE = 30
 
 SKIN = {
     'fname' : 'res/simulator_skin.png',
@@ -39,13 +64,166 @@ class ST7789Sim(object):
         self.cmd = 0
         self.mute = False
 
+        # Pixel format (either 12-bit RGB444 or 16-bit RGB565) and any bytes
+        # (or nibbles for RGB444) of a partially received pixel
+        self.depth = 16
+        self.pending = np.zeros(0, dtype=np.uint8)
+
+        # Time of the last refresh and whether the frame memory has been
+        # written since then
+        self.refreshed = 0
+        self.dirty = False
+
+        # Model the full frame memory (which is taller than the display)
+        # so that vertical scrolling can be simulated
+        self.gram = np.zeros((GRAM_HEIGHT, WIDTH), dtype=np.uint32)
+
+        # What the panel is currently showing (as RGB888)
+        self.framebuffer = np.zeros((HEIGHT, WIDTH), dtype=np.uint32)
+        self.scroll_area = (0, GRAM_HEIGHT, 0)
+        self.scroll = 0
+
+        # Low power modes
+        self.partial_area = (0, HEIGHT-1)
+        self.partial = False
+        self.idle = False
+
+    def rows(self):
+        """Calculate which row of frame memory is shown on each display row."""
+        (tfa, vsa, bfa) = self.scroll_area
+        rows = np.arange(HEIGHT)
+        area = (rows >= tfa) & (rows < tfa + vsa)
+        rows[area] = tfa + (rows[area] - tfa + self.scroll - tfa) % vsa
+        return rows
+
+    def refresh(self):
+        pixels = self.framebuffer
+        pixels[:] = self.gram[self.rows()]
+        if self.idle:
+            # Only the most significant bit of each colour is displayed
+            pixels[:] = ((pixels & 0x808080) >> 7) * 0xff
+        if self.partial:
+            (start, end) = self.partial_area
+            pixels[:start] = 0
+            pixels[end+1:] = 0
+
+        if window:
+            pixelview = sdl2.ext.pixels2d(windowsurface)
+            ax = SKIN['adjust'][0]
+            ay = SKIN['adjust'][1]
+            pixelview[ax:ax+WIDTH, ay:ay+HEIGHT] = pixels.T
+
+            # Forcibly release the surface to ensure it is unlocked
+            del pixelview
+            if not self.mute:
+                window.refresh()
+
+        self.refreshed = time.monotonic()
+        self.dirty = False
+
+    def update(self, force=False):
+        """Refresh the display if the frame memory has been written.
+
+        Unless forced, refreshes are limited to FRAME_RATE so that a
+        sequence of writes can be shown as a single frame.
+        """
+        if self.dirty and (force or
+                time.monotonic() - self.refreshed >= 1 / FRAME_RATE):
+            self.refresh()
+
+    def decode(self, data):
+        """Convert RAMWR data into RGB888 pixels.
+
+        Any trailing bytes (or nibbles) that do not make up a whole pixel are
+        kept and will be combined with the next write.
+        """
+        raw = np.frombuffer(data, dtype=np.uint8)
+
+        if self.depth == 12:
+            # Split the data into nibbles, each pixel is made from three
+            units = np.empty(2 * len(raw), dtype=np.uint8)
+            units[0::2] = raw >> 4
+            units[1::2] = raw & 0xf
+            units = np.concatenate((self.pending, units))
+            n = len(units) // 3
+            self.pending = units[3*n:]
+            rgb = units[:3*n].astype(np.uint32).reshape(n, 3)
+            return (rgb[:, 0] << 20) + (rgb[:, 1] << 12) + (rgb[:, 2] << 4)
+
+        units = np.concatenate((self.pending, raw))
+        n = len(units) // 2
+        self.pending = units[2*n:]
+        rgb = units[:2*n].view('>u2').astype(np.uint32)
+        #pixel = ((rgb & 0xf800) >> 8,
+        #         (rgb & 0x07e0) >> 3,
+        #         (rgb & 0x001f) << 3)
+        return (((rgb & 0xf800) << 8) +
+                ((rgb & 0x07e0) << 5) +
+                ((rgb & 0x001f) << 3))
+
+    def store(self, pixels):
+        """Write pixels into the window, starting at the current position.
+
+        The window is filled a row at a time and wraps back to the top-left
+        when it is full.
+        """
+        (x0, x1) = self.colclip
+        (y0, y1) = self.rowclip
+        w = x1 - x0 + 1
+        size = w * (y1 - y0 + 1)
+        gram = self.gram
+
+        # Only the last pass over the window is visible
+        pos = (self.y - y0) * w + self.x - x0
+        if len(pixels) > size:
+            pos = (pos + len(pixels) - size) % size
+            pixels = pixels[-size:]
+
+        while len(pixels):
+            # Never write beyond the bottom-right of the window
+            n = min(len(pixels), size - pos)
+            chunk = pixels[:n]
+            pixels = pixels[n:]
+            (row, col) = divmod(pos, w)
+            y = y0 + row
+
+            # Complete the current row
+            if col:
+                k = min(n, w - col)
+                gram[y, x0+col:x0+col+k] = chunk[:k]
+                chunk = chunk[k:]
+                y += 1
+
+            # Whole rows
+            rows = len(chunk) // w
+            if rows:
+                gram[y:y+rows, x0:x1+1] = chunk[:rows*w].reshape(rows, w)
+                chunk = chunk[rows*w:]
+                y += rows
+
+            # Start of the next row
+            if len(chunk):
+                gram[y, x0:x0+len(chunk)] = chunk
+
+            pos = (pos + n) % size
+
+        (row, col) = divmod(pos, w)
+        self.x = x0 + col
+        self.y = y0 + row
+
     def write(self, data):
         # Converting data to a memoryview ensures we act more like spi.write()
         # when running in a real device (e.g. data must be  bytes-like object
         # that implements the buffer protocol)
         data = memoryview(data)
 
-        if len(data) == 1:
+        if self.cmd == COLMOD:
+            # The parameter is only one byte long so it must be handled
+            # before it is mistaken for a command
+            self.depth = 12 if (data[0] & 0x7) == 3 else 16
+            self.cmd = 0
+
+        elif len(data) == 1:
             # Assume if we get a byte at a time then it is command.
             # This is a simplification do we don't have to track
             # the D/C pin from within the simulator.
@@ -54,9 +232,21 @@ class ST7789Sim(object):
                 self.mute = True
             elif cmd == DISPON:
                 self.mute = False
-                window.refresh()
+                self.refresh()
+            elif cmd in (PTLON, NORON):
+                self.partial = cmd == PTLON
+                self.refresh()
+            elif cmd in (IDMON, IDMOFF):
+                self.idle = cmd == IDMON
+                self.refresh()
             else:
                 self.cmd = data[0]
+                if cmd == RAMWR:
+                    # Writes always start from the top-left of the window
+                    # (which might not have been sent again)
+                    self.x = self.colclip[0]
+                    self.y = self.rowclip[0]
+                    self.pending = self.pending[0:0]
 
         elif self.cmd == CASET:
             self.colclip[0] = (data[0] << 8) + data[1]
@@ -67,46 +257,30 @@ class ST7789Sim(object):
 
         elif self.cmd == RASET:
             self.rowclip[0] = (data[0] << 8) + data[1]
-            assert(self.rowclip[0] >= 0 and self.rowclip[0] <= 240)
+            assert(self.rowclip[0] >= 0 and self.rowclip[0] < GRAM_HEIGHT)
             self.rowclip[1] = (data[2] << 8) + data[3]
-            assert(self.rowclip[1] >= 0 and self.rowclip[1] <= 240)
+            assert(self.rowclip[1] >= 0 and self.rowclip[1] < GRAM_HEIGHT)
             self.y = self.rowclip[0]
 
-        elif self.cmd == RAMWR:
-            #pixelview = sdl2.ext.PixelView(windowsurface)
-            pixelview = sdl2.ext.pixels2d(windowsurface)
+        elif self.cmd == PTLAR:
+            self.partial_area = ((data[0] << 8) + data[1],
+                                 (data[2] << 8) + data[3])
 
-            half = False
-            for d in data:
-                if not half:
-                    rgb = d << 8
-                    half = True
-                    continue
-                rgb |= d
-                half = False
-
-                #pixel = ((rgb & 0xf800) >> 8,
-                #         (rgb & 0x07e0) >> 3,
-                #         (rgb & 0x001f) << 3)
-                pixel = (((rgb & 0xf800) << 8) +
-                         ((rgb & 0x07e0) << 5) +
-                         ((rgb & 0x001f) << 3))
-            
-                pv_x = self.x + SKIN['adjust'][0]
-                pv_y = self.y + SKIN['adjust'][1]
-                pixelview[pv_x][pv_y] = pixel
-
-                self.x += 1
-                if self.x > self.colclip[1]:
-                    self.x = self.colclip[0]
-                    self.y += 1
-                if self.y > self.rowclip[1]:
-                    self.y = self.rowclip[0]
-            
-            # Forcibly release the surface to ensure it is unlocked
-            del pixelview
-            if not self.mute:
-                window.refresh()
+        elif self.cmd == VSCRDEF:
+            self.scroll_area = ((data[0] << 8) + data[1],
+                                (data[2] << 8) + data[3],
+                                (data[4] << 8) + data[5])
+            assert(sum(self.scroll_area) == GRAM_HEIGHT)
+            self.refresh()
+
+        elif self.cmd == VSCSAD:
+            self.scroll = (data[0] << 8) + data[1]
+            self.refresh()
+
+        elif self.cmd == RAMWR:
+            self.store(self.decode(data))
+            self.dirty = True
+            self.update()
 
 class CST816SSim():
     def __init__(self):
@@ -197,7 +371,7 @@ class CST816SSim():
 
     def swipe(self, direction):
         pins = wasp.watch.Pin.pins
-        if direction ==' up':
+        if direction == 'up':
             self.regs[1] = 1
         elif direction == 'down':
             self.regs[1] = 2
@@ -224,28 +398,42 @@ SKIN['window'] = (SKIN['size'][0] + SKIN['left_pad'] + SKIN['right_pad'],
 SKIN['adjust'] = (SKIN['offset'][0] + SKIN['left_pad'],
                   SKIN['offset'][1] + SKIN['top_pad'])
 
-sdl2.ext.init()
-window = sdl2.ext.Window("ST7789", size=SKIN['window'])
-window.show()
-windowsurface = window.get_surface()
-sdl2.ext.fill(windowsurface, (0xff, 0xff, 0xff))
-skin = sdl2.ext.load_image(SKIN['fname'])
-sdl2.SDL_BlitSurface(skin, None, windowsurface, sdl2.SDL_Rect(
-        SKIN['left_pad'], SKIN['top_pad'], SKIN['size'][0], SKIN['size'][1]))
-sdl2.SDL_FreeSurface(skin)
-window.refresh()
+if HEADLESS:
+    window = None
+    windowsurface = None
+else:
+    sdl2.ext.init()
+    window = sdl2.ext.Window("ST7789", size=SKIN['window'])
+    window.show()
+    windowsurface = window.get_surface()
+    sdl2.ext.fill(windowsurface, (0xff, 0xff, 0xff))
+    skin = sdl2.ext.load_image(SKIN['fname'])
+    sdl2.SDL_BlitSurface(skin, None, windowsurface, sdl2.SDL_Rect(
+            SKIN['left_pad'], SKIN['top_pad'],
+            SKIN['size'][0], SKIN['size'][1]))
+    sdl2.SDL_FreeSurface(skin)
+    window.refresh()
 
 spi_st7789_sim = ST7789Sim()
 i2c_cst816s_sim = CST816SSim()
 
-def save_image(surface, fname):
-    """Save a surface as an image."""
-    raw = sdl2.ext.pixels2d(surface)
+def screenshot(surface=None):
+    """Capture a surface, or the contents of the display, as RGB pixels.
+
+    :param surface: SDL surface to capture (with the skin cropped to the
+                    watch), defaults to capturing just the display
+    :returns:       numpy array of 8-bit (red, green, blue) pixels
+    """
+    if surface is None:
+        spi_st7789_sim.update(force=True)
+        cropped = spi_st7789_sim.framebuffer
+    else:
+        raw = sdl2.ext.pixels2d(surface)
 
-    # Crop and swap the axes to ensure the final rotation is correct
-    cropped = raw[SKIN['top_pad']:-SKIN['bottom_pad']]
-    cropped = np.swapaxes(cropped, 0, 1)
-    cropped = cropped[SKIN['left_pad']:-SKIN['right_pad']]
+        # Crop and swap the axes to ensure the final rotation is correct
+        cropped = raw[SKIN['top_pad']:-SKIN['bottom_pad']]
+        cropped = np.swapaxes(cropped, 0, 1)
+        cropped = cropped[SKIN['left_pad']:-SKIN['right_pad']]
 
     # Split into r, g and b
     r = cropped >> 16
@@ -253,12 +441,28 @@ def save_image(surface, fname):
     b = cropped & 0xff
 
     # Combine into the final pixel data
-    rgb = np.uint8(np.dstack((r, g, b)))
+    return np.uint8(np.dstack((r, g, b)))
 
-    # Save the image
-    Image.fromarray(rgb).save(fname)
+def save_image(surface, fname):
+    """Save a surface, or the contents of the display, as an image.
+
+    :param surface:   SDL surface to save (with the skin cropped to the
+                      watch) or None to save just the display
+    :param str fname: Filename of the image
+    """
+    Image.fromarray(screenshot(surface)).save(fname)
 
 def tick(pins):
+    """Update the window and handle any input.
+
+    :returns: True if there was input that the watch must handle
+    """
+    # Show anything that was drawn since the last frame
+    spi_st7789_sim.update(force=True)
+    if not window:
+        return False
+
+    handled = False
     events = sdl2.ext.get_events()
     for event in events:
         if event.type == sdl2.SDL_QUIT:
@@ -266,8 +470,10 @@ def tick(pins):
             sys.exit(0)
         elif event.type == sdl2.SDL_MOUSEBUTTONDOWN:
             i2c_cst816s_sim.handle_mousebuttondown(event.button, pins)
+            handled = True
         elif event.type == sdl2.SDL_MOUSEBUTTONUP:
             i2c_cst816s_sim.handle_mousebuttonup(event.button, pins)
+            handled = True
         elif event.type == sdl2.SDL_KEYDOWN:
             if event.key.keysym.sym == sdl2.SDLK_s:
                 fname = f'res/{wasp.system.app.NAME}App.png'.replace(' ', '')
@@ -275,11 +481,16 @@ def tick(pins):
                 print(f'Saved: {fname}')
             elif event.key.keysym.sym == sdl2.SDLK_TAB:
                 pins['BUTTON'].value(0)
+                handled = True
             else:
                 i2c_cst816s_sim.handle_key(event.key, pins)
+                handled = True
         elif event.type == sdl2.SDL_KEYUP:
             if event.key.keysym.sym == sdl2.SDLK_TAB:
                 pins['BUTTON'].value(1)
+                handled = True
         else:
             #print(event)
             pass
+
+    return handled
@@ -19,19 +19,26 @@ class ADC(Tracer):
 class Pin(object):
     IN = 'IN'
     OUT = 'OUT'
-    IRQ_FALLING = 'IRQ_FALLING'
+    IRQ_FALLING = 1
+    IRQ_RISING = 2
 
     pins = {}
 
+    # See profiler.Profiler
+    profiler = None
+
     def __init__(self, id, direction, value=1, quiet=False):
         self._id = id
         self._value = 0
         self._quiet = quiet
+        self._trigger = 0
+        self._handler = None
 
         # Update the pin registry
         self.pins[id] = self
 
     def irq(self, trigger, handler):
+        self._trigger = trigger
         self._handler = handler
 
     def init(self, d, value):
@@ -51,6 +58,9 @@ class Pin(object):
             if not self._quiet:
                 print(f'{self._id}: read {self._value}')
             return self._value
+        if self.profiler:
+            self.profiler.pin(self, v)
+        old = self._value
         if v:
             if not self._quiet:
                 print(self._id + ": set on")
@@ -60,6 +70,12 @@ class Pin(object):
                 print(self._id + ": set off")
             self._value = True
 
+        # Simulate edge triggered interrupts
+        if self._handler and old != self._value:
+            edge = self.IRQ_RISING if self._value else self.IRQ_FALLING
+            if self._trigger & edge:
+                self._handler(self)
+
     def __call__(self, v=None):
         self.value(v)
 
@@ -73,11 +89,15 @@ class SPI(object):
             self.sim = display.spi_st7789_sim
         else:
             self.sim = None
+        self.baudrate = 1000000
+        self.profiler = None
 
     def init(self, baudrate=1000000,  polarity=0, phase=0, bits=8, sck=None, mosi=None, miso=None):
-        pass
+        self.baudrate = baudrate
 
     def write(self, buf):
+        if self.profiler:
+            self.profiler.write(buf)
         if self.sim:
             self.sim.write(buf)
         else:
@@ -124,9 +144,30 @@ class Timer():
     def period(self):
         self.time()
 
-def lightsleep(ms=10):
-    display.tick(Pin.pins)
-    time.sleep(ms / 1000)
+# Longest sleep, in milliseconds, when waiting for the deadline (the RTC on
+# a real device will also wake the CPU regularly)
+MAX_SLEEP_MS = 1000
+
+def lightsleep(ms=None):
+    """Sleep until the deadline or until there is user input.
+
+    If no timeout is given the sleep lasts until ``watch.deadline`` but
+    never for longer than MAX_SLEEP_MS. Input, such as a mouse click, wakes
+    the simulator early just as an interrupt would on a real device.
+    """
+    import watch
+
+    if ms is None:
+        ms = MAX_SLEEP_MS
+        if watch.deadline is not None:
+            ms = min(ms, watch.deadline - watch.rtc.get_uptime_ms())
+    end = time.time() + ms / 1000
+
+    while not display.tick(Pin.pins):
+        remaining = end - time.time()
+        if remaining <= 0:
+            break
+        time.sleep(min(remaining, 0.01))
 
-def deepsleep(ms=10):
+def deepsleep(ms=None):
     lightsleep(ms)
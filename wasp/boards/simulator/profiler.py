@@ -0,0 +1,207 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2026 agent
+
+"""SPI transaction profiler for the simulated display.
+
+The simulator draws far faster than a real watch so it cannot be used to
+time rendering directly. Instead the profiler counts the traffic sent to the
+ST7789 (commands, window setups, pixel bytes and chip select cycles) and
+uses a simple cost model to estimate how long the same traffic would take
+on a device. Every transaction is attributed both to the application (and
+the event it was handling) and to the code that called the drawing library.
+
+.. code-block:: python
+
+    import profiler
+    from machine import Pin
+
+    with profiler.Profiler(wasp.watch.spi, Pin.pins['DISP_CS'],
+                           Pin.pins['DISP_DC']) as p:
+        p.start()
+        wasp.system.switch(wasp.system.quick_ring[0])
+        p.stop()
+    print(p.report())
+
+The profiler is detached from the bus when the ``with`` block ends (or when
+:py:meth:`~.Profiler.detach` is called) but the counts remain available.
+"""
+
+import sys
+
+_CASET = 0x2a
+_RASET = 0x2b
+_RAMWR = 0x2c
+
+# Estimated fixed costs, in microseconds, of driving the display from
+# MicroPython on an nRF52 (in addition to the time taken to clock out
+# the bytes)
+WRITE_OVERHEAD_US = 12
+CS_OVERHEAD_US = 4
+
+# Transactions are attributed to the first caller outside of these modules
+_LIBRARY = ('machine.py', 'st7789.py', 'draw565.py', 'profiler.py')
+
+class Counts(object):
+    """Traffic sent to the display."""
+    def __init__(self):
+        self.writes = 0
+        self.cs_cycles = 0
+        self.commands = 0
+        self.windows = 0
+        self.params = 0
+        self.pixels = 0
+
+    def bytes(self):
+        """Total number of bytes sent over the SPI bus."""
+        return self.commands + self.params + self.pixels
+
+    def estimate(self, baudrate):
+        """Estimate how long the traffic would take on a device.
+
+        :param int baudrate: SPI bus frequency
+        :returns: Time in microseconds
+        """
+        return (8000000 * self.bytes() // baudrate +
+                WRITE_OVERHEAD_US * self.writes +
+                CS_OVERHEAD_US * self.cs_cycles)
+
+class Profiler(object):
+    """Count, and estimate the cost of, the traffic sent to the display.
+
+    .. automethod:: __init__
+    """
+    def __init__(self, spi, cs, dc):
+        """Attach the profiler to the display bus.
+
+        The profiler is attached in a stopped state, see :py:meth:`~.start`,
+        and remains attached until :py:meth:`~.detach` is called.
+
+        :param spi: SPI controller the display is connected to
+        :param cs:  Chip select pin of the display
+        :param dc:  Data/command pin of the display
+        """
+        self.baudrate = spi.baudrate
+        self.enabled = False
+        self._spi = spi
+        self._cs = cs
+        self._dc = dc
+        self._command = False
+        self._last = None
+        self.reset()
+
+        spi.profiler = self
+        cs.profiler = self
+        dc.profiler = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.detach()
+
+    def detach(self):
+        """Stop counting and detach the profiler from the display bus."""
+        self.enabled = False
+        for hw in (self._spi, self._cs, self._dc):
+            if hw.profiler is self:
+                hw.profiler = None
+
+    def reset(self):
+        """Discard all counts."""
+        self.total = Counts()
+        self.apps = {}
+        self.sites = {}
+
+    def start(self):
+        """Start counting."""
+        self.enabled = True
+
+    def stop(self):
+        """Stop counting."""
+        self.enabled = False
+
+    def pin(self, pin, value):
+        """Record a change to the chip select or data/command pins."""
+        if pin is self._dc:
+            self._command = not value
+        elif pin is self._cs and not value and self.enabled:
+            for c in self._counts():
+                c.cs_cycles += 1
+
+    def write(self, buf):
+        """Record a write to the SPI bus."""
+        n = len(buf)
+        if self._command and n:
+            self._last = buf[n-1]
+        if not self.enabled:
+            return
+
+        for c in self._counts():
+            c.writes += 1
+            if self._command:
+                c.commands += n
+                if self._last == _RAMWR:
+                    c.windows += 1
+            elif self._last == _RAMWR:
+                c.pixels += n
+            else:
+                c.params += n
+
+    def _counts(self):
+        """Find the counts that the current transaction contributes to."""
+        frame = sys._getframe(2)
+        while frame and frame.f_code.co_filename.endswith(_LIBRARY):
+            frame = frame.f_back
+        if frame:
+            site = '{}:{}'.format(
+                    frame.f_code.co_filename.rsplit('/wasp/', 1)[-1],
+                    frame.f_lineno)
+        else:
+            site = '?'
+
+        # The event is the outermost method of the current app on the stack
+        wasp = sys.modules.get('wasp')
+        app = wasp.system.app if wasp and 'system' in dir(wasp) else None
+        event = '-'
+        while frame:
+            code = frame.f_code
+            if code.co_varnames[:1] == ('self',) and \
+                    frame.f_locals.get('self') is app:
+                event = code.co_name
+            frame = frame.f_back
+        name = '{}.{}'.format(app.NAME if 'NAME' in dir(app) else '-', event)
+
+        if name not in self.apps:
+            self.apps[name] = Counts()
+        if site not in self.sites:
+            self.sites[site] = Counts()
+        return (self.total, self.apps[name], self.sites[site])
+
+    def report(self, limit=20):
+        """Summarize the counts, most expensive first.
+
+        :param int limit: Maximum number of call sites to include
+        :returns: The report as a (multi-line) string
+        """
+        baudrate = self.baudrate
+        lines = []
+
+        def section(title, counts):
+            lines.append('{:<32} {:>6} {:>6} {:>6} {:>6} {:>8} {:>9}'.format(
+                    title, 'writes', 'cs', 'cmds', 'wins', 'bytes', 'est. ms'))
+            for (key, c) in counts:
+                lines.append(
+                    '{:<32} {:>6} {:>6} {:>6} {:>6} {:>8} {:>9.2f}'.format(
+                        key[-32:], c.writes, c.cs_cycles, c.commands,
+                        c.windows, c.bytes(), c.estimate(baudrate) / 1000))
+
+        def ranked(d):
+            return sorted(d.items(), key=lambda i: -i[1].estimate(baudrate))
+
+        section('Total @ {} Hz'.format(baudrate), (('', self.total),))
+        lines.append('')
+        section('App.event', ranked(self.apps))
+        lines.append('')
+        section('Call site', ranked(self.sites)[:limit])
+
+        return '\n'.join(lines)
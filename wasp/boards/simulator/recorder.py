@@ -0,0 +1,231 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2026 agent
+
+"""Recording display for unit tests.
+
+:py:class:`RecordingDisplay` is an ST7789 driver that, instead of driving a
+bus, records the exact stream of commands and data it would have sent. The
+stream can be replayed into a :py:class:`FrameMemory` so that tests can make
+assertions about the pixels that were drawn (and about how many transactions
+it took to draw them) without needing SDL or the rest of the simulator.
+
+.. code-block:: python
+
+    display = recorder.RecordingDisplay()
+    draw = draw565.Draw565(display)
+    display.clear()
+
+    draw.fill(0xf800, 10, 10, 4, 4)
+    assert display.windows == 1
+    assert display.replay().pixel(10, 10) == 0xf800
+"""
+
+import array
+import copy
+import sys
+import time
+
+if 'sleep_ms' not in dir(time):
+    def sleep_ms(ms):
+        time.sleep(ms / 1000)
+    time.sleep_ms = sleep_ms
+
+from drivers.st7789 import ST7789
+
+_CASET = 0x2a
+_RASET = 0x2b
+_RAMWR = 0x2c
+_COLMOD = 0x3a
+
+# Commands are distinguished from data lengths in the stream by this flag
+_CMD = 0x80000000
+
+class RecordingDisplay(ST7789):
+    """ST7789 driver that records everything it sends to the display.
+
+    The stream holds one entry per write. Commands are recorded as the
+    opcode (with the top bit set) and data as its length, the data itself is
+    appended to ``data``.
+
+    .. automethod:: __init__
+    """
+    def __init__(self, width=240, height=240, lines=1):
+        """Create the display (and record its initialization sequence).
+
+        :param int width:  Width of the display
+        :param int height: Height of the display
+        :param int lines:  Height, in rows, of the line buffer
+        """
+        self.frame = FrameMemory(width)
+        self.stream = array.array('I')
+        self.data = bytearray()
+        self.cs_cycles = 0
+        super().__init__(width, height, lines)
+
+    def clear(self):
+        """Start a new recording.
+
+        Everything recorded so far is applied to ``frame``, which holds the
+        state of the display as it was when the recording started.
+        """
+        self._apply(self.frame)
+        self.stream = array.array('I')
+        self.data = bytearray()
+        self.cs_cycles = 0
+
+    @property
+    def windows(self):
+        """Number of times a window was opened for writing pixels."""
+        return self.count(_RAMWR)
+
+    def count(self, cmd):
+        """Count how many times a command was sent.
+
+        :param int cmd: Command opcode
+        """
+        return self.stream.count(_CMD | cmd)
+
+    def replay(self):
+        """Replay the recording.
+
+        :returns: A copy of ``frame`` with the recording applied to it
+        """
+        frame = self.frame.copy()
+        self._apply(frame)
+        return frame
+
+    def _apply(self, frame):
+        mv = memoryview(self.data)
+        dp = 0
+        for entry in self.stream:
+            if entry & _CMD:
+                frame.command(entry & 0xff)
+            else:
+                frame.write(mv[dp:dp+entry])
+                dp += entry
+
+    def reset(self):
+        self.write_cmd(0x01)
+
+    def write_cmd(self, cmd, params=None):
+        self.cs_cycles += 1
+        self.stream.append(_CMD | cmd)
+        if params:
+            self.quick_write(params)
+
+    def write_data(self, buf):
+        self.cs_cycles += 1
+        self.quick_write(buf)
+
+    def quick_start(self):
+        self.cs_cycles += 1
+
+    def quick_write(self, buf):
+        self.stream.append(len(buf))
+        self.data += buf
+
+    def quick_end(self):
+        pass
+
+class FrameMemory(object):
+    """Model of the ST7789 frame memory.
+
+    Pixels are stored as RGB565 (pixels sent as RGB444 are converted).
+
+    .. automethod:: __init__
+    """
+    def __init__(self, width=240, height=320):
+        """Create a zeroed frame memory.
+
+        :param int width:  Width of the frame memory
+        :param int height: Height of the frame memory (the ST7789 has 320
+                           rows even though only 240 are visible)
+        """
+        self.width = width
+        self.height = height
+        self.pixels = array.array('H', bytes(2 * width * height))
+        self.depth = 16
+        self._cmd = None
+        self._cols = (0, width-1)
+        self._rows = (0, height-1)
+        self._pos = 0
+        self._pending = b''
+
+    def copy(self):
+        """Make an independent copy of the frame memory."""
+        frame = copy.copy(self)
+        frame.pixels = array.array('H', self.pixels)
+        return frame
+
+    def pixel(self, x, y):
+        """Get the colour of a pixel (in RGB565 format)."""
+        return self.pixels[y*self.width + x]
+
+    def rect(self, x, y, w, h):
+        """Get the colours of a rectangle of pixels, one row at a time."""
+        return [ self.pixels[(y+r)*self.width + x:(y+r)*self.width + x+w]
+                        for r in range(h) ]
+
+    def command(self, cmd):
+        self._cmd = cmd
+        if cmd == _RAMWR:
+            self._pos = 0
+            self._pending = b''
+
+    def write(self, data):
+        cmd = self._cmd
+        if cmd == _CASET:
+            self._cols = ((data[0] << 8) + data[1], (data[2] << 8) + data[3])
+        elif cmd == _RASET:
+            self._rows = ((data[0] << 8) + data[1], (data[2] << 8) + data[3])
+        elif cmd == _COLMOD:
+            self.depth = 12 if (data[0] & 7) == 3 else 16
+        elif cmd == _RAMWR:
+            self._store(self._decode(bytes(data)))
+
+    def _decode(self, data):
+        """Convert pixel data into RGB565."""
+        data = self._pending + data
+        if self.depth == 16:
+            n = len(data) & ~1
+            self._pending = data[n:]
+            px = array.array('H', data[:n])
+            if sys.byteorder == 'little':
+                px.byteswap()
+            return px
+
+        # RGB444, two pixels are packed into every three bytes
+        n = len(data) // 3 * 3
+        px = array.array('H')
+        for i in range(0, n, 3):
+            a = (data[i] << 4) | (data[i+1] >> 4)
+            b = ((data[i+1] & 0xf) << 8) | data[i+2]
+            px.append(((a & 0xf00) << 4) | ((a & 0xf0) << 3) | ((a & 0xf) << 1))
+            px.append(((b & 0xf00) << 4) | ((b & 0xf0) << 3) | ((b & 0xf) << 1))
+        if len(data) - n == 2:
+            # A lone pixel is padded to two bytes and ends the write
+            a = (data[n] << 4) | (data[n+1] >> 4)
+            px.append(((a & 0xf00) << 4) | ((a & 0xf0) << 3) | ((a & 0xf) << 1))
+            n += 2
+        self._pending = data[n:]
+        return px
+
+    def _store(self, px):
+        """Write pixels into the window (wrapping at the end of each row)."""
+        (x0, x1) = self._cols
+        (y0, y1) = self._rows
+        w = x1 - x0 + 1
+        size = w * (y1 - y0 + 1)
+        pixels = self.pixels
+        stride = self.width
+        pos = self._pos
+
+        i = 0
+        while i < len(px):
+            (row, col) = divmod(pos, w)
+            n = min(w - col, len(px) - i)
+            dp = (y0 + row) * stride + x0 + col
+            pixels[dp:dp+n] = px[i:i+n]
+            i += n
+            pos = (pos + n) % size
+        self._pos = pos
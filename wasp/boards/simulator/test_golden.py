@@ -0,0 +1,154 @@
+"""Golden image tests.
+
+Every application is brought to the foreground, allowed to tick a few times
+and then tapped in the centre of the screen. The display is captured after
+each of these steps and compared against a stored golden image. The clock,
+battery, step counter and random numbers are all fixed so the images are
+repeatable.
+
+The tests only run when WASP_SIM_GOLDEN is set (and work best together with
+WASP_SIM_HEADLESS):
+
+.. code-block:: sh
+
+    # Record the golden images
+    WASP_SIM_GOLDEN=update WASP_SIM_HEADLESS=1 make check
+
+    # Compare against the golden images
+    WASP_SIM_GOLDEN=check WASP_SIM_HEADLESS=1 make check
+
+When an image does not match, a diff image (golden, actual and the
+differences highlighted in magenta) is saved in res/golden/diff/.
+"""
+
+import numpy as np
+import os
+import pytest
+import random
+import time
+import wasp
+
+import display
+
+from PIL import Image
+
+MODE = os.environ.get('WASP_SIM_GOLDEN')
+GOLDEN = 'res/golden'
+DIFF = 'res/golden/diff'
+
+# 2021-04-01 10:09:00 UTC
+EPOCH = 1617271740
+
+pytestmark = pytest.mark.skipif(MODE not in ('check', 'update'),
+        reason='set WASP_SIM_GOLDEN to check (or update) the golden images')
+
+class Clock(object):
+    """Simulated time that only moves when it is told to.
+
+    Every read of the clock moves it on by a millisecond. This is still
+    repeatable but ensures that code that busy waits (such as the heart
+    rate monitor) will terminate.
+    """
+    def __init__(self):
+        self.now = EPOCH
+
+    def time(self):
+        self.now += 0.001
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fix everything (other than the app) that can change the display."""
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock.time)
+
+    watch = wasp.watch
+    monkeypatch.setattr(watch.rtc, '_epoch', EPOCH - 1000)
+    monkeypatch.setattr(watch.rtc, 'get_localtime',
+                        lambda: time.gmtime(int(clock.now))[:8])
+    monkeypatch.setattr(watch.battery, 'level', lambda: 80)
+    monkeypatch.setattr(watch.battery, 'voltage_mv', lambda: 3900)
+    monkeypatch.setattr(watch.battery, 'charging', lambda: False)
+    monkeypatch.setattr(watch.battery, 'power', lambda: False)
+    monkeypatch.setattr(type(watch.accel), 'steps',
+                        property(lambda self: 1234, lambda self, v: None))
+    monkeypatch.setattr(wasp.system, 'notifications', {})
+
+    # Alarms set at the simulated time must not leak into later tests
+    monkeypatch.setattr(watch.rtc, '_lasttime', watch.rtc._lasttime)
+    monkeypatch.setattr(wasp.system, '_alarms', [])
+    monkeypatch.setattr(wasp.system, '_alarm_cancelled', 0)
+    random.seed(0)
+
+    wasp.system.secondary_init()
+    if not wasp.system.sleep_at:
+        wasp.system.wake()
+    wasp.system.keep_awake()
+    yield clock
+
+    # Restore the real clock and then restart the tick and the blanking
+    # timeout (both of which were calculated using simulated time)
+    monkeypatch.undo()
+    wasp.system.switch(wasp.system.quick_ring[0])
+    wasp.system.keep_awake()
+
+def capture():
+    return display.screenshot()
+
+def compare(name, actual):
+    fname = f'{GOLDEN}/{name}.png'
+
+    if MODE == 'update':
+        os.makedirs(GOLDEN, exist_ok=True)
+        Image.fromarray(actual).save(fname)
+        return
+
+    if not os.path.exists(fname):
+        pytest.skip(f'{fname} does not exist')
+    golden = np.asarray(Image.open(fname).convert('RGB'))
+
+    mismatch = np.any(golden != actual, axis=2)
+    if mismatch.any():
+        highlight = actual // 4
+        highlight[mismatch] = (0xff, 0, 0xff)
+        os.makedirs(DIFF, exist_ok=True)
+        Image.fromarray(np.hstack((golden, actual, highlight))).save(
+                f'{DIFF}/{name}.png')
+    assert not mismatch.any(), \
+            f'{name}: {mismatch.sum()} pixels differ from {fname}'
+
+def test_golden(clock, constructor):
+    system = wasp.system
+    name = constructor.NAME.replace(' ', '')
+
+    # Special case for the notification app
+    if 'NotificationApp' in str(constructor):
+        system.notify(1000, {
+            "src": "testcase",
+            "title": "A test",
+            "body": "This is a long message containingaverylongwordthatdoesnotfit and lots of other contents as well."
+        })
+
+    try:
+        app = constructor()
+    except FileNotFoundError:
+        # Some apps intend to generate exceptions during the constructor
+        # if they don't have required files available
+        pytest.skip(f'{name} cannot be constructed')
+
+    images = []
+    try:
+        system.switch(app)
+        for i in range(3):
+            clock.now += 1
+            system._tick()
+        images.append((name, capture()))
+
+        display.i2c_cst816s_sim.press(120, 120)
+        system._tick()
+        images.append((f'{name}-press', capture()))
+    finally:
+        system.switch(system.quick_ring[0])
+
+    for (name, actual) in images:
+        compare(name, actual)
@@ -1,12 +1,18 @@
 import pytest
+import sys
 import time
 import wasp
+import apps.pager
 import apps.testapp
 import apps.settings
+import apps.steps
+import profiler
+
+from machine import Pin
 
 def step():
     wasp.system._tick()
-    wasp.machine.deepsleep()
+    wasp.machine.deepsleep(10)
     time.sleep(0.1)
 wasp.system.step = step
 
@@ -50,6 +56,25 @@ def test_app(system, name):
         system.step()
     system.switch(system.quick_ring[0])
 
+def test_profiler(system):
+    with profiler.Profiler(wasp.watch.spi, Pin.pins['DISP_CS'],
+                           Pin.pins['DISP_DC']) as p:
+        p.start()
+        for app in system.quick_ring:
+            system.switch(app)
+            system.step()
+        p.stop()
+    system.switch(system.quick_ring[0])
+    assert(wasp.watch.spi.profiler is None)
+    print(p.report())
+
+    # Every app draws something when it is brought to the foreground
+    for app in system.quick_ring:
+        counts = p.apps[app.NAME + '.foreground']
+        assert counts.windows and counts.pixels
+    assert p.total.bytes() == sum([ c.bytes() for c in p.apps.values() ])
+    assert p.total.bytes() == sum([ c.bytes() for c in p.sites.values() ])
+
 def test_constructor(system, constructor):
     # Special case for the notification app
     if 'NotificationApp' in str(constructor):
@@ -95,6 +120,125 @@ def test_stopwatch(system):
 
     system.step()
 
+def test_alarms(system):
+    fired = []
+    def action(n):
+        return lambda: fired.append(n)
+
+    now = wasp.watch.rtc.time()
+    handles = [ system.set_alarm(now - n, action(n)) for n in range(8) ]
+    later = system.set_alarm(now + 3600, action(-1))
+    assert(system.cancel_alarm(handles[3]))
+    assert(not system.cancel_alarm(handles[3]))
+    assert(system.cancel_alarm(now - 5, fired.append) is False)
+
+    # Every expired alarm runs, oldest first, in a single tick
+    system._run_alarms(now)
+    assert(fired == [7, 6, 5, 4, 2, 1, 0])
+    assert(not system.cancel_alarm(handles[0]))
+
+    assert(system.cancel_alarm(later))
+    assert(all(a[2] is not action for a in system._alarms))
+
+    # An expired alarm queued by an action does not block older alarms
+    fired.clear()
+    def requeue():
+        fired.append('requeue')
+        system.set_alarm(now - 100, action('new'))
+    system.set_alarm(now - 10, requeue)
+    system.set_alarm(now - 5, action(5))
+    system._run_alarms(now)
+    assert(fired == ['requeue', 5])
+    system._run_alarms(now)
+    assert(fired == ['requeue', 5, 'new'])
+
+def test_deadline(system):
+    rtc = wasp.watch.rtc
+    system.keep_awake()
+    system.request_tick(1000)
+    deadline = system.next_deadline()
+    assert(rtc.get_uptime_ms() < deadline <= system.tick_expiry)
+
+    alarm = system.set_alarm(rtc.time() - 1, lambda: None)
+    assert(system.next_deadline() <= rtc.get_uptime_ms())
+    system.cancel_alarm(alarm)
+    system._run_alarms(rtc.time())
+
+    wasp.watch.touch.press(120, 120)
+    assert(system.next_deadline() <= rtc.get_uptime_ms())
+    system.step()
+
+    # A sleeping watch still polls the charger
+    system.sleep()
+    assert(system.next_deadline() <= rtc.get_uptime_ms() + 1000)
+    system.wake()
+
+def test_pager_background(system, monkeypatch):
+    # The display is muted before the scroll offset is restored
+    app = apps.pager.PagerApp('A message\n' * 30)
+    system.switch(app)
+    cmds = []
+    with monkeypatch.context() as m:
+        m.setattr(wasp.watch.display, 'write_cmd',
+                  lambda cmd, params=None: cmds.append(cmd))
+        app.background()
+    assert(cmds.index(0x28) < cmds.index(0x37))
+    system.switch(system.quick_ring[0])
+
+def test_events(system, monkeypatch):
+    # A short button press between ticks is not lost
+    system.switch(apps.settings.SettingsApp())
+    wasp.watch.button.value(0)
+    wasp.watch.button.value(1)
+    system.step()
+    assert(system.app == system.quick_ring[0])
+
+    # Repeated swipes are coalesced (but taps are not)
+    handled = []
+    monkeypatch.setattr(system, '_handle_touch', lambda e: handled.append(e[0]))
+    for kind in (1, 1, 1, 5, 5, 2):
+        system._events.put(kind, 120, 120)
+    system._handle_events()
+    assert(handled == [1, 5, 5, 2])
+
+def test_lazy_app(system):
+    sys.modules.pop('apps.calc', None)
+    system.register('apps.calc.CalculatorApp', unload=True)
+    lazy = [ a for a in system.launcher_ring if 'cls_name' in dir(a) and
+                                        a.cls_name == 'CalculatorApp' ][0]
+    assert(lazy.instance is None and 'apps.calc' not in sys.modules)
+
+    system.switch(lazy)
+    assert(type(system.app).__name__ == 'CalculatorApp')
+    system.app.PERSIST = ('marker',)
+    system.app.marker = 42
+    system.step()
+
+    # Unloaded when sent to the background, state is restored on reload
+    system.switch(system.quick_ring[0])
+    assert(lazy.instance is None and 'apps.calc' not in sys.modules)
+    system.switch(lazy)
+    assert(system.app.marker == 42)
+
+    system.switch(system.quick_ring[0])
+    system.launcher_ring.remove(lazy)
+
+def test_lazy_step_counter(system):
+    steps = system.__dict__.pop('steps', None)
+    try:
+        system.register('apps.steps.StepCounterApp', lazy=True)
+        app = [ a for a in system.launcher_ring
+                        if isinstance(a, apps.steps.StepCounterApp) ][0]
+        assert('steps' in dir(system))
+
+        system.switch(app)
+        system.step()
+        system.switch(system.quick_ring[0])
+        system.launcher_ring.remove(app)
+    finally:
+        if steps:
+            system.steps = steps
+
 def test_selftests(system):
     """Walk though each screen in the Self Test.
 
@@ -1,18 +1,32 @@
+import array
 import draw565
+import icons
 import fonts
+import gcpolicy
+import math
+import profiler
 import pytest
+import recorder
 
 @pytest.fixture
 def draw():
     """Provide a RGB565 drawing surface.
 
-    Currently most of the draw565 functions will not work since we haven't
-    mocked up the display. This limits the testing that we can perform.
+    The surface is not connected to a display, use the display fixture
+    for tests that need to draw.
     """
     d = draw565.Draw565(None)
 
     return d
 
+@pytest.fixture
+def display():
+    """Provide a display that records what is drawn on it."""
+    d = recorder.RecordingDisplay()
+    d.clear()
+
+    return d
+
 def test_lighten(draw):
     assert draw.lighten(0b00000_000000_00000         ) == 0b00001_000010_00001
     assert draw.lighten(0b00000_000000_00000, 0b00001) == 0b00001_000010_00001
@@ -58,6 +72,13 @@ def test_font_width(draw):
         if f.max_ch() >= 90:
             assert draw.bounding_box('IIII')[0] < draw.bounding_box('WWWW')[0]
 
+def test_font_widths():
+    for f in (fonts.sans18, fonts.sans24, fonts.sans28, fonts.sans36):
+        widths = fonts.widths(f)
+        assert fonts.widths(f) is widths
+        for ch in 'AIW0 ~\u00e9\n':
+            assert fonts.width(f, ch) == f.get_ch(ch)[2] + 1
+
 @pytest.mark.parametrize("input,expected", (
     ('abc', [0, 3]),
     ('one.two', [0, 7]),
@@ -70,3 +91,377 @@ def test_font_width(draw):
 ))
 def test_wrap(draw, input, expected):
     assert draw.wrap(input, 240) == expected
+
+def test_damage():
+    groups = []
+
+    # Side-by-side rectangles of the same height merge
+    draw565._damage(groups, (0, 0, 10, 10, 0, 0), 240)
+    draw565._damage(groups, (10, 0, 10, 10, 0, 0), 240)
+    assert len(groups) == 1
+    assert groups[0][:4] == [0, 0, 20, 10]
+
+    # Contained rectangles merge
+    draw565._damage(groups, (5, 5, 5, 5, 0, 0), 240)
+    assert len(groups) == 1
+
+    # Rectangles that would leave gaps in the window do not merge
+    draw565._damage(groups, (25, 5, 10, 10, 0, 0), 240)
+    assert len(groups) == 2
+
+    # Painter's order must be preserved: this rectangle could extend the
+    # first group but it would be overdrawn by the second group
+    draw565._damage(groups, (20, 0, 10, 10, 0, 0), 240)
+    assert len(groups) == 3
+    assert groups[0][:4] == [0, 0, 20, 10]
+
+    # Large groups are not extended
+    groups = []
+    draw565._damage(groups, (0, 0, 240, 240, 0, 0), 240)
+    draw565._damage(groups, (10, 10, 10, 10, 0, 0), 240)
+    assert len(groups) == 2
+
+    # ... and neither are groups wider than the line buffer
+    groups = []
+    draw565._damage(groups, (0, 0, 100, 10, 0, 0), 120)
+    draw565._damage(groups, (100, 0, 100, 10, 0, 0), 120)
+    assert len(groups) == 2
+
+@pytest.mark.parametrize('glyph_cache', (0, 4096))
+def test_frame_wide(display, glyph_cache):
+    draw = draw565.Draw565(display, glyph_cache=glyph_cache)
+    fb = {}
+    for frame in (False, True):
+        display.linebuffer = memoryview(bytearray(2 * 240))
+        display.clear()
+        draw.fill(0)
+        if frame:
+            draw.begin()
+
+        # A string wider than the space allowed for it
+        draw.string('12:34', 100, 0, width=40)
+
+        # Shapes, fills and groups wider than the line buffer
+        display.linebuffer = display.linebuffer[0:2*100]
+        draw.circle(120, 150, 80, 0xf800)
+        draw.fill(0x07e0, 0, 100, 160, 10)
+        draw.fill(0x001f, 0, 40, 80, 10)
+        draw.fill(0x001f, 80, 40, 80, 10)
+        if frame:
+            draw.end()
+        fb[frame] = display.replay()
+
+    assert fb[True].rect(0, 0, 240, 240) == fb[False].rect(0, 0, 240, 240)
+    assert any(any(row) for row in fb[True].rect(60, 0, 120, 24))
+    assert fb[True].pixel(120, 150) == 0xf800
+
+def test_frame_reset(draw):
+    draw.begin()
+    draw.reset()
+    assert draw._frame is None
+
+def test_glyph_cache():
+    cache = draw565.GlyphCache(2048)
+
+    a = cache.get(fonts.sans24, 'A', 0xffff)
+    (px, h, w) = a
+    assert len(px) == 2 * (w+1) * h
+    assert cache.get(fonts.sans24, 'A', 0xffff) is a
+    assert cache.get(fonts.sans24, 'A', 0xf800) is not a
+
+    # Fill the cache until 'A' (the least recently used glyph) is evicted
+    for ch in 'BCDEFGHIJK':
+        cache.get(fonts.sans24, ch, 0xffff)
+    assert cache.size <= 2048
+    assert cache.get(fonts.sans24, 'A', 0xffff) is not a
+
+    # Using a glyph makes it the most recently used
+    k = cache.get(fonts.sans24, 'K', 0xffff)
+    for ch in 'LMNOP':
+        cache.get(fonts.sans24, ch, 0xffff)
+        assert cache.get(fonts.sans24, 'K', 0xffff) is k
+    assert len(cache._order) == len(cache._cache)
+
+def rle2bit_reference(image, fg, c1, c2):
+    """Decode a 2-bit RLE image in the same way as the original blitter."""
+    palette = [0, c1, c2, fg]
+    next_color = 1
+    rl = 0
+    out = bytearray()
+    for op in image[3:]:
+        if rl == 0:
+            px = op >> 6
+            rl = op & 0x3f
+            if 0 == rl:
+                rl = -1
+                continue
+            if rl >= 63:
+                continue
+        elif rl > 0:
+            rl += op
+            if op >= 255:
+                continue
+        else:
+            palette[next_color] = draw565._clut8_rgb565(op)
+            next_color = next_color + 1 if next_color < 3 else 1
+            rl = 0
+            continue
+        out += palette[px].to_bytes(2, 'big') * rl
+        rl = 0
+    return out
+
+# 4x3 image with palette switches (including one that wraps around)
+_PALETTE_IMAGE = bytes((2, 4, 3,
+                        0x42, 0x00, 0x10, 0x82, 0x00, 0x20, 0x00, 0x30,
+                        0x00, 0x40, 0x41, 0xc3, 0x04))
+
+@pytest.mark.parametrize("image", (icons.app, _PALETTE_IMAGE))
+@pytest.mark.parametrize("chunk", (1, 7, 48, 240))
+def test_rle2bit_decode(image, chunk):
+    sx = image[1]
+    sy = image[2]
+
+    def decode(count):
+        buf = bytearray(2 * count)
+        out = bytearray()
+        state = draw565._rle2bit_state(image, 0xffff, 0x4a69, 0x7bef)
+        while True:
+            n = draw565._rle2bit_decode(buf, count, image, state)
+            out += buf[0:2*n]
+            if n < count:
+                return out
+
+    expected = rle2bit_reference(image, 0xffff, 0x4a69, 0x7bef)
+    assert len(expected) == 2 * sx * sy
+    assert decode(chunk) == expected
+
+def test_image_cache():
+    cache = draw565.ImageCache(2 * 1536)
+
+    px = cache.get(icons.battery, 0xffff, 0x4a69, 0x7bef)
+    assert len(px) == 2 * icons.battery[1] * icons.battery[2]
+    assert cache.get(icons.battery, 0xffff, 0x4a69, 0x7bef) is px
+    assert cache.get(icons.battery, 0xf800, 0x4a69, 0x7bef) is not px
+
+    # Images bigger than the budget are never cached
+    assert cache.get(icons.knob, 0xffff, 0x4a69, 0x7bef) is None
+
+def test_pack444():
+    buf = bytearray(b'\xff\xff\xf8\x00\x07\xe0\x00\x1f')
+    assert draw565._pack444(buf, 4) == 6
+    assert buf[0:6] == b'\xff\xff\x00\x0f\x00\x0f'
+
+    # An odd pixel is padded to two bytes
+    buf = bytearray(b'\xff\xff\x12\x34\x56\x78')
+    assert draw565._pack444(buf, 3) == 5
+    assert buf[0:5] == b'\xff\xf1\x4a\x5c\xc0'
+
+def test_sin_q15():
+    for theta in range(-720, 1440, 7):
+        radians = theta * math.pi / 360
+        assert abs(draw565.sin_q15(theta) - 32768 * math.sin(radians)) <= 1
+        assert abs(draw565.cos_q15(theta) - 32768 * math.cos(radians)) <= 1
+
+    assert draw565.mul_q15(draw565.sin_q15(180), 118) == 118
+    assert draw565.mul_q15(draw565.sin_q15(540), 118) == -118
+    assert draw565.mul_q15(draw565.cos_q15(120), 100) == 50
+
+def test_polar(draw, monkeypatch):
+    lines = []
+    monkeypatch.setattr(draw, 'line', lambda *args: lines.append(args))
+
+    # Angles are rounded (rather than truncated) to the nearest half degree
+    draw.polar(120, 120, 44.8, 0, 100)
+    draw.polar_half(120, 120, 90, 0, 100)
+    draw.polar(120, 120, 45, 0, 100)
+    assert lines[0] == lines[1] == lines[2]
+    assert lines[0][:4] == (120, 120, 190, 50)
+
+def test_shape_row():
+    def row(shapes, y, x=0, w=24):
+        buf = bytearray(2 * w)
+        draw565._shape_row(buf, draw565._compile_shapes(shapes), y, x, w, 0)
+        return ''.join('#' if buf[i] else '.' for i in range(0, len(buf), 2))
+
+    # Polygons cover the same pixels as the equivalent fill()
+    square = ((draw565.POLYGON, 0xffff, ((2, 2), (10, 2), (10, 6), (2, 6))),)
+    assert row(square, 1) == '.' * 24
+    assert row(square, 2) == '..########..............'
+    assert row(square, 5) == '..########..............'
+    assert row(square, 6) == '.' * 24
+    assert row(square, 4, 4, 4) == '####'
+
+    circle = ((draw565.CIRCLE, 0xffff, 12, 12, 5),)
+    assert row(circle, 7) == '............#...........'
+    assert row(circle, 12) == '.......###########......'
+
+    ring = ((draw565.RING, 0xffff, 12, 12, 3, 5, 0, 360),)
+    assert row(ring, 12) == '.......###.....###......'
+    arc = ((draw565.RING, 0xffff, 12, 12, 3, 5, 0, 180),)
+    assert row(arc, 12) == '...............###......'
+    arc = ((draw565.RING, 0xffff, 12, 12, 3, 5, 270, 90),)
+    assert row(arc, 12) == '.......###.....###......'
+    assert row(arc, 14) == '.' * 24
+
+def test_canvas():
+    class Display:
+        linebuffer = memoryview(bytearray(2 * 240))
+        def rawblit(self, buf, x, y, w, h):
+            self.blit = (bytes(buf), x, y, w, h)
+
+    display = Display()
+    buf = bytearray(2 * 8 * 4)
+    canvas = draw565.Canvas(draw565.Draw565(display), buf, 8, 4)
+    canvas.fill(0x1234)
+    canvas.fill(0xffff, 6, 2, 4, 4)  # Partially off the canvas
+    assert buf[0:2] == b'\x12\x34'
+    assert buf[-6:] == b'\x12\x34\xff\xff\xff\xff'
+
+    canvas.flush(10, 20)
+    assert display.blit == (bytes(buf), 10, 20, 8, 4)
+
+def test_profiler():
+    class Bus:
+        baudrate = 8000000
+
+    spi = Bus()
+    cs = Bus()
+    dc = Bus()
+    p = profiler.Profiler(spi, cs, dc)
+    assert spi.profiler is p
+
+    def transaction(cmd, data):
+        p.pin(cs, 0)
+        p.pin(dc, 0)
+        p.write(bytes((cmd,)))
+        p.pin(dc, 1)
+        p.write(data)
+        p.pin(cs, 1)
+
+    transaction(0x2a, bytes(4))     # Ignored, profiler not started
+    p.start()
+    transaction(0x2a, bytes(4))
+    transaction(0x2c, bytes(480))
+    transaction(0x2c, bytes(480))
+    p.stop()
+
+    t = p.total
+    assert (t.writes, t.cs_cycles, t.commands, t.windows) == (6, 3, 3, 2)
+    assert (t.params, t.pixels) == (4, 960)
+    assert t.estimate(8000000) == 967 + 6*profiler.WRITE_OVERHEAD_US + \
+                                        3*profiler.CS_OVERHEAD_US
+    assert sum([ c.bytes() for c in p.sites.values() ]) == t.bytes()
+    assert 'est. ms' in p.report()
+
+    p.detach()
+    assert (spi.profiler, cs.profiler, dc.profiler) == (None, None, None)
+
+def test_gcpolicy():
+    heap = { 'alloc': 1000, 'free': 60000 }
+    p = gcpolicy.GCPolicy(threshold=4096, low_water=8192)
+    p._mem_alloc = lambda: heap['alloc']
+    p._mem_free = lambda: heap['free']
+    p._baseline = 1000
+
+    dropped = []
+    p.register(lambda: dropped.append(True))
+
+    assert not p.tick()
+    heap['alloc'] = 6000
+    assert p.tick()
+    assert (p.collections, p.peak) == (1, 6000)
+    assert not dropped
+
+    # Low memory collects (and drops caches) regardless of the threshold
+    heap['free'] = 4000
+    assert p.tick()
+    assert p.collections == 3
+    assert len(dropped) == 1
+
+    # ... but only once until memory has recovered
+    assert not p.tick()
+    heap['alloc'] = 12000
+    assert p.tick()
+    assert (p.collections, len(dropped)) == (4, 1)
+
+    heap['free'] = 60000
+    p.collect()
+    heap['free'] = 4000
+    assert p.tick()
+    assert (p.collections, len(dropped)) == (7, 2)
+
+def test_fill(display):
+    draw = draw565.Draw565(display)
+    draw.fill(0xf800, 10, 20, 30, 4)
+    assert display.windows == 1
+    assert display.cs_cycles == 4
+    fb = display.replay()
+    assert fb.rect(10, 20, 30, 4) == [ array.array('H', [0xf800] * 30) ] * 4
+    assert fb.pixel(9, 20) == 0 and fb.pixel(40, 20) == 0
+    assert fb.pixel(10, 19) == 0 and fb.pixel(10, 24) == 0
+
+    # The window has not changed so it is only opened again
+    display.clear()
+    draw.fill(0x07e0, 10, 20, 30, 4)
+    assert (display.count(0x2a), display.count(0x2b)) == (0, 0)
+    assert display.cs_cycles == 2
+    assert display.replay().pixel(39, 23) == 0x07e0
+
+def test_fill_rgb444(display):
+    draw = draw565.Draw565(display)
+    draw.set_depth(12)
+    draw.fill(0xffff, 0, 0, 5, 1)
+    assert display.count(0x3a) == 2
+    assert len(display.data) == 1 + 4 + 4 + 8 + 1
+    assert display.replay().rect(0, 0, 6, 1)[0] == \
+                array.array('H', [0xf79e] * 5 + [0])
+
+def test_string(display):
+    draw = draw565.Draw565(display)
+    draw.set_color(0xffff, 0x001f)
+    draw.string('A', 0, 0, width=40)
+    assert display.windows == 1
+
+    (px, h, w) = fonts.sans24.get_ch('A')
+    bytes_per_row = (w + 7) // 8
+    x = (40 - (w + 1)) // 2
+    fb = display.replay()
+    for y in range(h):
+        for i in range(40):
+            c = i - x
+            set = 0 <= c < w and \
+                  px[y*bytes_per_row + c//8] & (0x80 >> (c % 8))
+            assert fb.pixel(i, y) == (0xffff if set else 0x001f)
+    assert fb.pixel(0, h) == 0
+
+def test_blit(display):
+    draw = draw565.Draw565(display)
+    image = icons.app
+    draw.blit(image, 10, 10, 0xf800, 0x07e0, 0x001f)
+    assert display.windows == 1
+
+    (sx, sy) = (image[1], image[2])
+    pixels = rle2bit_reference(image, 0xf800, 0x07e0, 0x001f)
+    expected = array.array('H', pixels)
+    expected.byteswap()
+    rows = display.replay().rect(10, 10, sx, sy)
+    assert [ rows[y] == expected[y*sx:(y+1)*sx] for y in range(sy) ] == \
+           [ True ] * sy
+
+def test_line(display):
+    draw = draw565.Draw565(display)
+    draw.line(0, 0, 9, 9, 1, 0xffff)
+    fb = display.replay()
+    for y in range(10):
+        assert fb.rect(0, y, 10, 1)[0] == \
+                array.array('H', [0xffff if x == y else 0 for x in range(10)])
+
+    # Horizontal and vertical lines are a single fill
+    display.clear()
+    draw.line(10, 20, 100, 20, 3, 0xf800)
+    assert display.windows == 1
+    fb = display.replay()
+    assert fb.pixel(9, 19) == 0xf800 and fb.pixel(101, 21) == 0xf800
+    assert fb.pixel(8, 19) == 0 and fb.pixel(102, 21) == 0
+    assert fb.pixel(9, 18) == 0 and fb.pixel(9, 22) == 0
+    assert fb.pixel(5, 5) == 0xffff
@@ -180,8 +180,9 @@ spi.init(polarity=1, phase=1, baudrate=8000000)
 display = ST7789_SPI(240, 240, spi,
         cs=Pin("DISP_CS", Pin.OUT, quiet=True),
         dc=Pin("DISP_DC", Pin.OUT, quiet=True),
-        res=Pin("DISP_RST", Pin.OUT, quiet=True))
-drawable = draw565.Draw565(display)
+        res=Pin("DISP_RST", Pin.OUT, quiet=True),
+        lines=4)
+drawable = draw565.Draw565(display, glyph_cache=4096, image_cache=6144)
 
 accel = Accelerometer()
 battery = Battery()
@@ -196,3 +197,7 @@ def connected():
 
 # Free memory cannot be measured on the simulator
 free = 0
+
+# Uptime (in milliseconds) when the system manager next needs to run, this
+# is updated by the manager before it sleeps (see machine.deepsleep)
+deadline = None
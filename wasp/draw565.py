@@ -16,6 +16,11 @@ R = const(0b11111_000000_00000)
 G = const(0b00000_111111_00000)
 B = const(0b00000_000000_11111)
 
+# Shape descriptors for Draw565.shapes()
+CIRCLE = const(0)   # (CIRCLE, color, x, y, r)
+RING = const(1)     # (RING, color, x, y, r0, r1, start, end)
+POLYGON = const(2)  # (POLYGON, color, ((x0, y0), (x1, y1), ...))
+
 @micropython.viper
 def _bitblit(bitbuf, pixels, bgfg: int, count: int):
     mv = ptr16(bitbuf)
@@ -62,6 +67,92 @@ def _clut8_rgb565(i: int) -> int:
 
     return rgb565
 
+# Precomputed 8-bit colour lookup table for 2-bit RLE images
+_CLUT8 = array.array('H', (_clut8_rgb565(i) for i in range(256)))
+
+@micropython.viper
+def _rle2bit_decode(buf, count: int, rle, state) -> int:
+    """Decode up to count pixels of a 2-bit RLE image into buf.
+
+    The decoder can be suspended at any point (typically when buf is full) and
+    resumed by a subsequent call. state holds the position in the RLE stream,
+    any partially decoded run and the palette (see
+    :py:func:`_rle2bit_state`). The palette is updated as colour changes are
+    found in the RLE stream.
+
+    :returns: The number of pixels decoded (which will be less than count only
+              if the end of the RLE stream is reached)
+    """
+    out = ptr16(buf)
+    src = ptr8(rle)
+    st = ptr32(state)
+    clut = ptr16(_CLUT8)
+
+    sp = int(st[0])
+    rl = int(st[1])
+    px = int(st[2])
+    mode = int(st[3])
+    nc = int(st[4])
+    end = int(st[5])
+    bp = 0
+
+    while bp < count:
+        if mode == 0 and rl:
+            # Emit (as much as possible of) the current run
+            n = count - bp
+            if rl < n:
+                n = rl
+            rl -= n
+            color = int(st[6 + px])
+            color = ((color >> 8) | (color << 8)) & 0xffff
+            n += bp
+            while bp < n:
+                out[bp] = color
+                bp += 1
+            continue
+
+        if sp >= end:
+            break
+        op = src[sp]
+        sp += 1
+
+        if mode == 0:
+            px = op >> 6
+            rl = op & 0x3f
+            if rl == 0:
+                mode = 2
+            elif rl >= 63:
+                mode = 1
+        elif mode == 1:
+            # Extended run length
+            rl += op
+            if op < 255:
+                mode = 0
+        else:
+            # Palette switch
+            st[6 + nc] = clut[op]
+            nc += 1
+            if nc > 3:
+                nc = 1
+            mode = 0
+
+    st[0] = sp
+    st[1] = rl
+    st[2] = px
+    st[3] = mode
+    st[4] = nc
+    return bp
+
+def _rle2bit_state(image, fg, c1, c2):
+    """Create the initial state for :py:func:`_rle2bit_decode`.
+
+    The decoder starts just after the 3 byte image header and the next
+    palette switch will replace the first colour. The state holds the
+    stream position, the current run, the decoder mode, the next palette
+    entry to replace, the length of the stream and the four colour palette.
+    """
+    return array.array('I', (3, 0, 0, 0, 1, len(image), 0, c1, c2, fg))
+
 @micropython.viper
 def _fill(mv, color: int, count: int, offset: int):
     p = ptr16(mv)
@@ -70,17 +161,91 @@ def _fill(mv, color: int, count: int, offset: int):
     for x in range(offset, offset+count):
         p[x] = color
 
+@micropython.viper
+def _pack444(buf, count: int) -> int:
+    """Convert RGB565 pixels into packed RGB444, in place.
+
+    Each pair of pixels is packed into three bytes. If count is odd then the
+    final pixel is padded to two bytes (the display ignores the spare bits).
+
+    :returns: The number of bytes of packed pixels
+    """
+    p = ptr8(buf)
+    sp = 0
+    dp = 0
+    pairs = count >> 1
+    while pairs:
+        a = (p[sp] << 8) | p[sp+1]
+        b = (p[sp+2] << 8) | p[sp+3]
+        a = ((a >> 4) & 0xf00) | ((a >> 3) & 0xf0) | ((a >> 1) & 0xf)
+        b = ((b >> 4) & 0xf00) | ((b >> 3) & 0xf0) | ((b >> 1) & 0xf)
+        p[dp] = a >> 4
+        p[dp+1] = ((a << 4) & 0xf0) | (b >> 8)
+        p[dp+2] = b & 0xff
+        sp += 4
+        dp += 3
+        pairs -= 1
+    if count & 1:
+        a = (p[sp] << 8) | p[sp+1]
+        a = ((a >> 4) & 0xf00) | ((a >> 3) & 0xf0) | ((a >> 1) & 0xf)
+        p[dp] = a >> 4
+        p[dp+1] = (a << 4) & 0xf0
+        dp += 2
+    return dp
+
+# Quarter-wave sine table, in 0.5 degree steps, scaled so that 1.0 is 32768
+_SIN_Q15 = array.array('H',
+        (int(math.sin(i * math.pi / 360) * 32768 + 0.5) for i in range(181)))
+
+@micropython.native
+def sin_q15(theta):
+    """Integer sine using a lookup table.
+
+    :param int theta: Angle, in half degrees (e.g. 180 is 90 degrees)
+    :returns: The sine of theta scaled by 32768 (Q15)
+    """
+    theta %= 720
+    if theta < 180:
+        return _SIN_Q15[theta]
+    if theta < 360:
+        return _SIN_Q15[360 - theta]
+    if theta < 540:
+        return -_SIN_Q15[theta - 360]
+    return -_SIN_Q15[720 - theta]
+
+@micropython.native
+def cos_q15(theta):
+    """Integer cosine using a lookup table.
+
+    :param int theta: Angle, in half degrees
+    :returns: The cosine of theta scaled by 32768 (Q15)
+    """
+    return sin_q15(theta + 180)
+
+@micropython.native
+def mul_q15(v, r):
+    """Scale an integer by a Q15 value (rounding towards zero).
+
+    Together with :py:func:`sin_q15` and :py:func:`cos_q15` this allows
+    points on a circle to be calculated without floating point:
+
+    .. code-block:: python
+
+        # Tip of a 100 pixel long minute hand (navigational angles)
+        theta = 12 * minutes
+        x = 120 + draw565.mul_q15(draw565.sin_q15(theta), 100)
+        y = 120 - draw565.mul_q15(draw565.cos_q15(theta), 100)
+    """
+    p = v * r
+    if p < 0:
+        return -(-p >> 15)
+    return p >> 15
+
 def _bounding_box(s, font):
     if not s:
         return (0, font.height())
 
-    get_ch = font.get_ch
-    w = len(s)
-    for ch in s:
-        (_, h, wc) = get_ch(ch)
-        w += wc
-
-    return (w, h)
+    return (fonts.width(font, s), font.height())
 
 @micropython.native
 def _draw_glyph(display, glyph, x, y, bgfg):
@@ -100,6 +265,399 @@ def _draw_glyph(display, glyph, x, y, bgfg):
         quick_write(buf)
     display.quick_end()
 
+@micropython.native
+def _render_glyph(glyph, bgfg):
+    """Expand a glyph (and its 1px right margin) into RGB565 pixels."""
+    (px, h, w) = glyph
+    stride = 2 * (w+1)
+    bytes_per_row = (w + 7) // 8
+
+    buf = bytearray(stride * h)
+    mv = memoryview(buf)
+    for row in range(h):
+        rp = row * stride
+        _bitblit(mv[rp:], px[row*bytes_per_row:], bgfg, w)
+        buf[rp + stride - 2] = bgfg >> 24
+        buf[rp + stride - 1] = (bgfg >> 16) & 0xff
+
+    return mv
+
+class _LRUCache(object):
+    """Byte budgeted least-recently-used cache.
+
+    MicroPython dictionaries do not remember the order in which keys were
+    inserted so the recency of each entry is tracked by a separate list of
+    keys (least recently used first). The caches are small so searching
+    the list is cheap.
+    """
+    def __init__(self, budget):
+        self.budget = budget
+        self.size = 0
+        self._cache = {}
+        self._order = []
+
+    def _lookup(self, key):
+        """Find an entry and mark it as the most recently used."""
+        entry = self._cache.get(key)
+        if entry:
+            order = self._order
+            if order[-1] != key:
+                order.remove(key)
+                order.append(key)
+        return entry
+
+    def _reserve(self, sz):
+        """Discard the least recently used entries to make space.
+
+        :returns: True if an entry of sz bytes can be inserted.
+        """
+        if sz > self.budget:
+            return False
+        cache = self._cache
+        order = self._order
+        while self.size + sz > self.budget:
+            old = cache.pop(order.pop(0))
+            self.size -= len(old[0])
+        return True
+
+    def _insert(self, key, entry):
+        self._cache[key] = entry
+        self._order.append(key)
+        self.size += len(entry[0])
+
+    def clear(self):
+        """Discard all cached entries."""
+        self._cache = {}
+        self._order = []
+        self.size = 0
+
+class GlyphCache(_LRUCache):
+    """Least-recently-used cache of pre-rendered glyphs.
+
+    Rendering a glyph requires every pixel to be expanded from the 1-bit
+    font data. Text that is redrawn frequently (such as the time) uses the
+    same glyphs, in the same colours, over and over again so keeping the
+    expanded RGB565 pixels allows them to be sent straight to the display.
+
+    .. automethod:: __init__
+    """
+    def __init__(self, budget):
+        """Create an empty cache.
+
+        :param int budget: Maximum number of bytes of pixel data to keep. The
+                           least recently used glyphs are discarded when the
+                           budget is exceeded.
+        """
+        super().__init__(budget)
+
+    def get(self, font, ch, bgfg):
+        """Lookup (or render) a glyph.
+
+        :param font: Font module to render the glyph from
+        :param ch:   Character to render
+        :param bgfg: Background and foreground colours packed as in
+                     :py:meth:`Draw565.set_color`
+        :returns:    Tuple of (pixels, height, width) where pixels contains
+                     height rows of width+1 RGB565 pixels
+        """
+        key = (font, ch, bgfg)
+        glyph = self._lookup(key)
+        if glyph:
+            return glyph
+
+        (px, h, w) = font.get_ch(ch)
+        glyph = (_render_glyph((px, h, w), bgfg), h, w)
+        if self._reserve(len(glyph[0])):
+            self._insert(key, glyph)
+
+        return glyph
+
+class ImageCache(_LRUCache):
+    """Least-recently-used cache of decoded 2-bit RLE images.
+
+    Icons such as the ones on the status bar are redrawn frequently and
+    always in the same colours. Keeping the decoded RGB565 pixels means they
+    can be sent straight to the display. Decoded images are large so the
+    system manager also empties the cache when the garbage collection policy
+    reports that memory is low (see :py:mod:`gcpolicy`).
+
+    .. automethod:: __init__
+    """
+    def __init__(self, budget):
+        """Create an empty cache.
+
+        :param int budget: Maximum number of bytes of pixel data to keep.
+        """
+        super().__init__(budget)
+
+    def get(self, image, fg, c1, c2):
+        """Lookup (or decode) an image.
+
+        :param image: 2-bit RLE image
+        :returns:     Decoded RGB565 pixels or None if the image is not cached
+                      and there is no room to add it
+        """
+        key = (id(image), fg, c1, c2)
+        entry = self._lookup(key)
+        if entry:
+            return entry[0]
+
+        count = image[1] * image[2]
+        if not self._reserve(2*count):
+            return None
+
+        pixels = bytearray(2*count)
+        _rle2bit_decode(pixels, count, image,
+                        _rle2bit_state(image, fg, c1, c2))
+
+        # Keep a reference to the image, its id() must not be reused
+        self._insert(key, (pixels, image))
+        return pixels
+
+@micropython.native
+def _string_row(buf, row, offset, glyphs, bgfg, rendered):
+    """Render a single row of a line of text into buf.
+
+    Only the glyphs are drawn, the caller is responsible for filling the
+    padding and the gaps between glyphs with the background colour.
+    """
+    for (gx, glyph) in glyphs:
+        (px, h, w) = glyph
+        if rendered:
+            # Pre-rendered glyphs can simply be copied
+            stride = 2 * (w+1)
+            bp = 2 * (offset+gx)
+            rp = row * stride
+            buf[bp:bp+stride-2] = px[rp:rp+stride-2]
+        else:
+            bytes_per_row = (w + 7) // 8
+            _bitblit(buf[2*(offset+gx):], px[row*bytes_per_row:], bgfg, w)
+
+def _rle2bit_rows(image, fg, c1, c2):
+    """Decode a 2-bit RLE image one row at a time.
+
+    This is a generator that, once primed with ``next()``, decodes the next
+    row of the image into the buffer passed to ``send()``. It allows the
+    rows of an image to be interleaved with other drawing operations (see
+    :py:meth:`Draw565.begin`).
+    """
+    sx = image[1]
+    state = _rle2bit_state(image, fg, c1, c2)
+
+    buf = yield
+    while True:
+        _rle2bit_decode(buf, sx, image, state)
+        buf = yield
+
+def _pixel_rows(pixels, sx):
+    """Copy a decoded image one row at a time.
+
+    Works in the same way as :py:func:`_rle2bit_rows` but for images that
+    have already been decoded.
+    """
+    stride = 2 * sx
+    mv = memoryview(pixels)
+    buf = yield
+    for rp in range(0, len(pixels), stride):
+        buf[0:stride] = mv[rp:rp+stride]
+        buf = yield
+
+@micropython.native
+def _isqrt(n):
+    """Integer square root (rounded down)."""
+    if n <= 0:
+        return 0
+    x = n
+    y = (x + 1) // 2
+    while y < x:
+        x = y
+        y = (x + n // x) // 2
+    return x
+
+def _compile_shapes(shapes):
+    """Convert shape descriptors into the form used by :py:func:`_shape_row`.
+
+    Circles become rings without a hole and arcs are split into pieces of no
+    more than 180 degrees so that each piece is bounded by a pair of
+    half-planes (a wedge). Polygons are reduced to their non-horizontal
+    edges, each stored with its top-most point first.
+    """
+    compiled = []
+    for shape in shapes:
+        kind = shape[0]
+        if kind == CIRCLE:
+            (_, color, x, y, r) = shape
+            compiled.append((RING, color, x, y, 0, r, None))
+        elif kind == RING:
+            (_, color, x, y, r0, r1, start, end) = shape
+            start = int(start)
+            end = int(end)
+            if end < start:
+                end += 360
+            if end - start >= 360:
+                compiled.append((RING, color, x, y, r0, r1, None))
+                continue
+            while start < end:
+                stop = min(end, start + 180)
+                wedge = (sin_q15(2*start), -cos_q15(2*start),
+                         sin_q15(2*stop), -cos_q15(2*stop))
+                compiled.append((RING, color, x, y, r0, r1, wedge))
+                start = stop
+        else:
+            (_, color, points) = shape
+            edges = []
+            (xa, ya) = points[-1]
+            ymin = ymax = ya
+            for (xb, yb) in points:
+                if ya < yb:
+                    edges.append((xa, ya, xb, yb))
+                elif yb < ya:
+                    edges.append((xb, yb, xa, ya))
+                ymin = min(ymin, yb)
+                ymax = max(ymax, yb)
+                (xa, ya) = (xb, yb)
+            compiled.append((POLYGON, color, ymin, ymax, edges))
+    return compiled
+
+@micropython.native
+def _span(buf, color, a, b, x, w, offset):
+    """Fill pixels a to b (inclusive) after clipping them to x to x+w-1."""
+    if a < x:
+        a = x
+    if b >= x + w:
+        b = x + w - 1
+    if a <= b:
+        _fill(buf, color, b - a + 1, offset + a - x)
+
+@micropython.native
+def _shape_row(buf, shapes, y, x, w, offset):
+    """Render the spans covered by a list of compiled shapes on row y.
+
+    Pixels are included if their centre lies within the shape. Only the
+    shapes are drawn, the caller is responsible for filling the rest of the
+    row. Columns x to x+w-1 are rendered into buf starting at offset.
+    """
+    for shape in shapes:
+        if shape[0] == POLYGON:
+            (_, color, ymin, ymax, edges) = shape
+            if y < ymin or y >= ymax:
+                continue
+
+            # Find where the pixel centres on this row cross the edges
+            a = 0x7fff
+            b = -0x7fff
+            for (xa, ya, xb, yb) in edges:
+                if ya <= y and y < yb:
+                    # First pixel whose centre is on or right of the edge
+                    d = yb - ya
+                    n = (2*xa - 1) * d + (2*(y - ya) + 1) * (xb - xa)
+                    e = -((-n) // (2*d))
+                    if e < a:
+                        a = e
+                    if e > b:
+                        b = e
+            _span(buf, color, a, b - 1, x, w, offset)
+            continue
+
+        (_, color, cx, cy, r0, r1, wedge) = shape
+        dy = y - cy
+        if dy < -r1 or dy > r1:
+            continue
+        hw = _isqrt(r1*r1 - dy*dy)
+        lo = cx - hw
+        hi = cx + hw
+
+        if wedge:
+            # Clip to the half-planes clockwise of the start direction
+            # and anticlockwise of the end direction
+            (sx, sy, ex, ey) = wedge
+            if sy > 0:
+                hi = min(hi, cx + (sx*dy) // sy)
+            elif sy < 0:
+                lo = max(lo, cx - ((-sx*dy) // sy))
+            elif sx*dy < 0:
+                continue
+            if ey > 0:
+                lo = max(lo, cx - ((-ex*dy) // ey))
+            elif ey < 0:
+                hi = min(hi, cx + (ex*dy) // ey)
+            elif ex*dy > 0:
+                continue
+
+        n = r0*r0 - dy*dy - 1
+        if n < 0:
+            _span(buf, color, lo, hi, x, w, offset)
+        else:
+            hole = _isqrt(n)
+            _span(buf, color, lo, min(hi, cx - hole - 1), x, w, offset)
+            _span(buf, color, max(lo, cx + hole + 1), hi, x, w, offset)
+
+# Frame operations are recorded as (x, y, w, h, kind, arg) tuples
+_OP_FILL = const(0)
+_OP_STRING = const(1)
+_OP_RLE = const(2)
+_OP_CALL = const(3)
+_OP_PIXELS = const(4)
+_OP_SHAPES = const(5)
+
+# Groups larger than this are not extended. Bands that mix several
+# operations are composed row by row, which is slower than letting each
+# operation draw itself, so merging a small update into (say) a full screen
+# fill would cost more than the extra window.
+_MAX_GROUP_AREA = const(240*64)
+
+def _overlaps(a, b):
+    """Check whether two (x, y, w, h, ...) rectangles intersect."""
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and \
+           a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+def _union(g, x, y, w, h):
+    """Calculate the union of a damage group and a rectangle.
+
+    :returns: The bounding box of the union if the group and the rectangle,
+              taken together, exactly cover their bounding box. Otherwise
+              None (since pixels we know nothing about would have to be
+              written).
+    """
+    gx, gy, gw, gh = g[0], g[1], g[2], g[3]
+    if gx <= x and gy <= y and x + w <= gx + gw and y + h <= gy + gh:
+        return (gx, gy, gw, gh)
+    if x <= gx and y <= gy and gx + gw <= x + w and gy + gh <= y + h:
+        return (x, y, w, h)
+    if x == gx and w == gw and y <= gy + gh and gy <= y + h:
+        y0 = min(y, gy)
+        return (x, y0, w, max(y + h, gy + gh) - y0)
+    if y == gy and h == gh and x <= gx + gw and gx <= x + w:
+        x0 = min(x, gx)
+        return (x0, y, max(x + w, gx + gw) - x0, h)
+    return None
+
+def _damage(groups, op, max_w):
+    """Add a drawing operation to a list of damage groups.
+
+    Each group is a list of [x, y, w, h, ops] where the rectangle is exactly
+    covered by the (solid) operations it contains. That allows every group to
+    be sent to the display using a single window. Operations may only join
+    an existing group if they do not overlap any of the groups that will be
+    drawn after it, which preserves the painter's order of the operations.
+    Groups are not allowed to grow beyond ``_MAX_GROUP_AREA`` pixels or
+    become wider than max_w (the number of pixels in the line buffer).
+    """
+    if op[4] != _OP_CALL:
+        for i in range(len(groups)-1, -1, -1):
+            g = groups[i]
+            if g[4][0][4] != _OP_CALL:
+                bbox = _union(g, op[0], op[1], op[2], op[3])
+                if bbox and bbox[2] <= max_w and \
+                        bbox[2] * bbox[3] <= _MAX_GROUP_AREA:
+                    g[0], g[1], g[2], g[3] = bbox
+                    g[4].append(op)
+                    return
+            if _overlaps(g, op):
+                break
+
+    groups.append([op[0], op[1], op[2], op[3], [op]])
+
 class Draw565(object):
     """Drawing library for RGB565 displays.
 
@@ -109,22 +667,194 @@ class Draw565(object):
     .. automethod:: __init__
     """
 
-    def __init__(self, display):
+    def __init__(self, display, glyph_cache=0, image_cache=0):
         """Initialise the library.
 
         Defaults to white-on-black for monochrome drawing operations
         and 24pt Sans Serif text.
+
+        :param display:     Display driver to draw on
+        :param glyph_cache: Size, in bytes, of the :py:class:`GlyphCache`
+                            used to speed up text rendering. Defaults to
+                            0 (no cache).
+        :param image_cache: Size, in bytes, of the :py:class:`ImageCache`
+                            used by :py:meth:`~.blit`. Defaults to 0 (no
+                            cache).
         """
         self._display = display
+        self._can_pack = hasattr(display, 'set_depth')
+        self._frame = None
+        self.glyph_cache = GlyphCache(glyph_cache) if glyph_cache else None
+        self.image_cache = ImageCache(image_cache) if image_cache else None
         self.reset()
 
     def reset(self):
-        """Restore the default colours and font.
+        """Restore the default colours, font and colour depth.
 
         Default colours are white-on-block (white foreground, black
-        background) and the default font is 24pt Sans Serif."""
+        background), the default font is 24pt Sans Serif and pixels are
+        sent to the display as RGB565.
+
+        Any frame that is still open (for example, because an exception was
+        raised between :py:meth:`~.begin` and :py:meth:`~.end`) is
+        discarded."""
+        self._frame = None
         self.set_color(0xffff)
         self.set_font(fonts.sans24)
+        self.set_depth(16)
+
+    def begin(self):
+        """Start collecting drawing operations into a frame.
+
+        Between :py:meth:`~.begin` and :py:meth:`~.end` calls to
+        :py:meth:`~.fill`, :py:meth:`~.string`, :py:meth:`~.blit`,
+        :py:meth:`~.shapes` (and the shape primitives built on it) and
+        :py:meth:`~.line` do not draw immediately. Instead they are recorded
+        as damage rectangles which are merged together and sent to the display
+        when the frame ends using as few windows as possible.
+
+        Example:
+
+        .. code-block:: python
+
+            draw = wasp.watch.drawable
+            draw.begin()
+            draw.fill(0, 0, 100, 240, 40)
+            draw.string('Hello', 0, 108, width=240)
+            draw.end()
+
+        Only drawing performed via the drawing library is deferred. Any
+        direct access to the display must not be mixed with a frame.
+        """
+        if self._frame is None:
+            self._frame = []
+
+    def _record(self, op):
+        """Add an operation to the current frame."""
+        _damage(self._frame, op, len(self._display.linebuffer) // 2)
+
+    def end(self):
+        """Complete the current frame and send it to the display."""
+        groups = self._frame
+        self._frame = None
+        if groups:
+            for g in groups:
+                self._draw_group(g)
+
+    def _draw_op(self, op):
+        """Draw a single frame operation without using the frame."""
+        (x, y, w, h, kind, arg) = op
+        if kind == _OP_FILL:
+            self.fill(arg, x, y, w, h)
+        elif kind == _OP_PIXELS:
+            self._display.rawblit(arg, x, y, w, h)
+        elif kind == _OP_RLE:
+            self._rle2bit(arg[0], x, y, arg[1], arg[2], arg[3])
+        elif kind == _OP_SHAPES:
+            self._shapes(arg[0], arg[1], x, y, w, h)
+
+    @micropython.native
+    def _draw_group(self, g):
+        """Send a damage group to the display using a single window."""
+        (x, y, w, h, ops) = g
+        op = ops[0]
+
+        if op[4] == _OP_CALL:
+            (fn, args) = op[5]
+            fn(*args)
+            return
+
+        display = self._display
+        stride = 2 * w
+        if stride > len(display.linebuffer):
+            # Only a single operation can be this wide (see _damage) and it
+            # cannot be composed in the line buffer
+            self._draw_op(op)
+            return
+
+        quick_write = display.quick_write
+        lines = len(display.linebuffer) // stride
+        buf = display.linebuffer[0:stride*lines]
+
+        # Split the group into bands where the same set of operations is
+        # active and prepare a row decoder for any images (together with
+        # its destination in each line of the line buffer)
+        edges = []
+        rows = []
+        views = []
+        for op in ops:
+            edges.append(op[1])
+            edges.append(op[1] + op[3])
+            if op[4] == _OP_RLE:
+                (image, fg, c1, c2) = op[5]
+                decoder = _rle2bit_rows(image, fg, c1, c2)
+            elif op[4] == _OP_PIXELS:
+                decoder = _pixel_rows(op[5], op[2])
+            else:
+                rows.append(None)
+                views.append(None)
+                continue
+            next(decoder)
+            bp = 2 * (op[0] - x)
+            rows.append(decoder)
+            views.append([ buf[bp+i*stride:bp+i*stride+2*op[2]]
+                                for i in range(lines) ])
+        edges = sorted(set(edges))
+
+        display.set_window(x, y, w, h)
+        display.quick_start()
+        for i in range(len(edges) - 1):
+            y0 = edges[i]
+            y1 = edges[i+1]
+            active = [ j for j in range(len(ops))
+                            if ops[j][1] < y1 and ops[j][1] + ops[j][3] > y0 ]
+
+            solid = True
+            for j in active:
+                if ops[j][4] != _OP_FILL:
+                    solid = False
+                    break
+
+            if solid:
+                # Every row in the band is identical
+                for line in range(lines):
+                    for j in active:
+                        op = ops[j]
+                        _fill(buf, op[5], op[2], line*w + op[0] - x)
+                n = y1 - y0
+                while n >= lines:
+                    quick_write(buf)
+                    n -= lines
+                if n:
+                    quick_write(buf[0:n*stride])
+                continue
+
+            line = 0
+            for row in range(y0, y1):
+                for j in active:
+                    op = ops[j]
+                    kind = op[4]
+                    ox = line*w + op[0] - x
+                    if kind == _OP_FILL:
+                        _fill(buf, op[5], op[2], ox)
+                    elif kind == _OP_STRING:
+                        (bgfg, glyphs, rendered) = op[5]
+                        _fill(buf, bgfg >> 16, op[2], ox)
+                        _string_row(buf, row - op[1], ox, glyphs, bgfg,
+                                    rendered)
+                    elif kind == _OP_SHAPES:
+                        (bg, shapes) = op[5]
+                        _fill(buf, bg, op[2], ox)
+                        _shape_row(buf, shapes, row, op[0], op[2], ox)
+                    else:
+                        rows[j].send(views[j][line])
+                line += 1
+                if line == lines:
+                    quick_write(buf)
+                    line = 0
+            if line:
+                quick_write(buf[0:line*stride])
+        display.quick_end()
 
     def fill(self, bg=None, x=0, y=0, w=None, h=None):
         """Draw a solid colour rectangle.
@@ -150,37 +880,74 @@ class Draw565(object):
         if h is None:
             h = display.height - y
 
-        display.set_window(x, y, w, h)
+        if self._frame is not None:
+            if w > 0 and h > 0:
+                self._record((x, y, w, h, _OP_FILL, bg))
+            return
 
         remaining = w * h
 
-        # Populate the line buffer
+        # Populate the line buffer (only whole pairs of pixels can be
+        # repeated when they are packed)
+        packed = self._depth == 12
         buf = display.linebuffer
         sz = len(buf) // 2
-        _fill(buf, bg, min(sz, remaining), 0)
+        if packed:
+            sz &= ~1
+        n = min(sz, remaining)
+        _fill(buf, bg, n, 0)
+        if packed:
+            buf = buf[0:_pack444(buf, n)]
+            display.set_depth(12)
 
+        display.set_window(x, y, w, h)
         display.quick_start()
         while remaining >= sz:
             quick_write(buf)
             remaining -= sz
         if remaining:
-            quick_write(buf[0:2*remaining])
+            quick_write(buf[0:(3*remaining+1)//2 if packed else 2*remaining])
         display.quick_end()
 
+        if packed:
+            display.set_depth(16)
+
     @micropython.native
-    def blit(self, image, x, y, fg=0xffff, c1=0x4a69, c2=0x7bef):
+    def blit(self, image, x, y, fg=0xffff, c1=0x4a69, c2=0x7bef, cache=False):
         """Decode and draw an encoded image.
 
         :param image: Image data in either 1-bit RLE or 2-bit RLE formats. The
                       format will be autodetected
         :param x: X coordinate for the left-most pixels in the image
         :param y: Y coordinate for the top-most pixels in the image
+        :param cache: If True (and the drawable has an :py:class:`ImageCache`)
+                      then keep the decoded image so that redrawing it is
+                      faster. Recommended for small images that are redrawn
+                      frequently.
         """
         if len(image) == 3:
-            # Legacy 1-bit image
-            self.rleblit(image, (x, y), fg)
-        else: #elif image[0] == 2:
-            # 2-bit RLE image, (255x255, v1)
+            if self._frame is not None:
+                self._record((x, y, image[0], image[1], _OP_CALL,
+                              (self.rleblit, (image, (x, y), fg))))
+            else:
+                # Legacy 1-bit image
+                self.rleblit(image, (x, y), fg)
+            return
+
+        # 2-bit RLE image, (255x255, v1)
+        pixels = None
+        if cache and self.image_cache:
+            pixels = self.image_cache.get(image, fg, c1, c2)
+
+        if self._frame is not None:
+            if pixels:
+                op = (x, y, image[1], image[2], _OP_PIXELS, pixels)
+            else:
+                op = (x, y, image[1], image[2], _OP_RLE, (image, fg, c1, c2))
+            self._record(op)
+        elif pixels:
+            self._display.rawblit(pixels, x, y, image[1], image[2])
+        else:
             self._rle2bit(image, x, y, fg, c1, c2)
 
     @micropython.native
@@ -223,54 +990,36 @@ class Draw565(object):
         quick_write = display.quick_write
         sx = image[1]
         sy = image[2]
-        rle = memoryview(image)[3:]
-
-        display.set_window(x, y, sx, sy)
 
-        if sx <= (len(display.linebuffer) // 4) and not bool(sy & 1):
-            sx *= 2
-            sy //= 2
+        # The window wraps at the end of each row so we can decode the image
+        # in chunks as large as the line buffer (regardless of width)
+        buf = display.linebuffer
+        count = len(buf) // 2
+        full = buf
+        state = _rle2bit_state(image, fg, c1, c2)
 
-        palette = array.array('H', (0, c1, c2, fg))
-        next_color = 1
-        rl = 0
-        buf = display.linebuffer[0:2*sx]
-        bp = 0
+        packed = self._depth == 12
+        if packed:
+            count &= ~1
+            full = buf[0:3*count//2]
+            display.set_depth(12)
 
+        display.set_window(x, y, sx, sy)
         display.quick_start()
-        for op in rle:
-            if rl == 0:
-                px = op >> 6
-                rl = op & 0x3f
-                if 0 == rl:
-                    rl = -1
-                    continue
-                if rl >= 63:
-                    continue
-            elif rl > 0:
-                rl += op
-                if op >= 255:
-                    continue
-            else:
-                palette[next_color] = _clut8_rgb565(op)
-                if next_color < 3:
-                    next_color += 1
-                else:
-                    next_color = 1
-                rl = 0
-                continue
-
-            while rl:
-                count = min(sx - bp, rl)
-                _fill(buf, palette[px], count, bp)
-                bp += count
-                rl -= count
-
-                if bp >= sx:
-                    quick_write(buf)
-                    bp = 0
+        while True:
+            n = _rle2bit_decode(buf, count, image, state)
+            if packed:
+                _pack444(buf, n)
+            if n < count:
+                if n:
+                    quick_write(buf[0:(3*n+1)//2 if packed else 2*n])
+                break
+            quick_write(full)
         display.quick_end()
 
+        if packed:
+            display.set_depth(16)
+
     def set_color(self, color, bg=0):
         """Set the foreground and background colours.
 
@@ -283,6 +1032,23 @@ class Draw565(object):
         """
         self._bgfg = (bg << 16) + color
 
+    def set_depth(self, depth):
+        """Set the colour depth used to send fills, 2-bit images and text.
+
+        At 12 bits per pixel these operations are packed as RGB444, which
+        sends a quarter less data to the display (and makes them faster) at
+        the cost of colour fidelity. Colours are still given as RGB565. All
+        other drawing operations continue to use RGB565.
+
+        Packing is only used if the display driver supports it, otherwise
+        the depth remains at 16 bits per pixel.
+
+        :param int depth: Bits per pixel, either 12 or 16
+        """
+        if not self._can_pack:
+            depth = 16
+        self._depth = depth
+
     def set_font(self, font):
         """Set the font used for rendering text.
 
@@ -310,24 +1076,126 @@ class Draw565(object):
         font = self._font
         bg = self._bgfg >> 16
 
+        if self._frame is not None:
+            self._string_op(s, x, y, width, right)
+            return
+
+        (w, h) = _bounding_box(s, font)
         if width:
-            (w, h) = _bounding_box(s, font)
-            if right:
-                leftpad = width - w
-                rightpad = 0
+            leftpad = width - w if right else (width - w) // 2
+        else:
+            leftpad = 0
+            width = w
+        if width <= 0:
+            return
+        (glyphs, rendered) = self._glyphs(s, leftpad)
+
+        if leftpad < 0 or 2 * width > len(display.linebuffer):
+            # Too wide to compose in the line buffer so draw the padding and
+            # each glyph separately
+            if leftpad > 0:
+                self.fill(bg, x, y, leftpad, h)
+            for (gx, glyph) in glyphs:
+                if rendered:
+                    display.set_window(x+gx, y, glyph[2]+1, glyph[1])
+                    display.write_data(glyph[0])
+                else:
+                    _draw_glyph(display, glyph, x+gx, y, bgfg)
+            rightpad = width - w - leftpad
+            if rightpad > 0:
+                self.fill(bg, x+leftpad+w, y, rightpad, h)
+            return
+
+        # Compose each row of text (including the padding and the gaps
+        # between glyphs) in the line buffer and send the whole string using
+        # a single window. Everything that is not a glyph is background so
+        # the padding only needs to be filled once.
+        lines = len(display.linebuffer) // (2*width)
+        packed = self._depth == 12
+        if packed and width & 1:
+            # Every write, except the last, must hold whole pairs of pixels
+            if lines > 1:
+                lines &= ~1
+            else:
+                packed = False
+        buf = display.linebuffer[0:2*width*lines]
+        _fill(buf, bg, width*lines, 0)
+        quick_write = display.quick_write
+
+        if packed:
+            display.set_depth(12)
+        display.set_window(x, y, width, h)
+        display.quick_start()
+        for row in range(0, h, lines):
+            n = min(lines, h - row)
+            if packed:
+                # Packing overwrites the padding so it must be refilled
+                _fill(buf, bg, width*n, 0)
+            for line in range(n):
+                _string_row(buf, row + line, line*width, glyphs, bgfg,
+                            rendered)
+            if packed:
+                quick_write(buf[0:_pack444(buf, width*n)])
             else:
-                leftpad = (width - w) // 2
-                rightpad = width - w - leftpad
-            self.fill(bg, x, y, leftpad, h)
-            x += leftpad
+                quick_write(buf if n == lines else buf[0:2*width*n])
+        display.quick_end()
+
+        if packed:
+            display.set_depth(16)
+
+    def _glyphs(self, s, x):
+        """Lookup the glyphs needed to draw a string.
 
+        :returns: Tuple of ([(x, glyph), ...], rendered) where rendered is
+                  True if the glyphs came from the :py:class:`GlyphCache`.
+        """
+        font = self._font
+        bgfg = self._bgfg
+        cache = self.glyph_cache
+        glyphs = []
         for ch in s:
-            glyph = font.get_ch(ch)
-            _draw_glyph(display, glyph, x, y, bgfg)
+            if cache:
+                glyph = cache.get(font, ch, bgfg)
+            else:
+                glyph = font.get_ch(ch)
+            glyphs.append((x, glyph))
             x += glyph[2] + 1
 
+        return (glyphs, bool(cache))
+
+    def _string_op(self, s, x, y, width, right):
+        """Record a string as part of the current frame."""
+        (w, h) = _bounding_box(s, self._font)
         if width:
-            self.fill(bg, x, y, rightpad, h)
+            leftpad = width - w if right else (width - w) // 2
+        else:
+            leftpad = 0
+            width = w
+        if width <= 0:
+            return
+
+        if leftpad < 0 or 2 * width > len(self._display.linebuffer):
+            # Too wide to compose in the line buffer so draw it without
+            # the frame (remembering the colours and font to draw it with)
+            x0 = x + min(0, leftpad)
+            self._record((x0, y, max(x + width, x + leftpad + w) - x0, h,
+                          _OP_CALL, (self._string_call, (self._bgfg,
+                                     self._font, s, x, y, width, right))))
+            return
+
+        (glyphs, rendered) = self._glyphs(s, leftpad)
+        self._record((x, y, width, h, _OP_STRING,
+                      (self._bgfg, glyphs, rendered)))
+
+    def _string_call(self, bgfg, font, s, x, y, width, right):
+        """Draw a string, recorded as part of a frame, immediately."""
+        saved = (self._bgfg, self._font)
+        self._bgfg = bgfg
+        self._font = font
+        try:
+            self.string(s, x, y, width, right)
+        finally:
+            (self._bgfg, self._font) = saved
 
     def bounding_box(self, s):
         """Return the bounding box of a string.
@@ -357,6 +1225,9 @@ class Draw565(object):
         :returns:     List of chunk boundaries
         """
         font = self._font
+        widths = fonts.widths(font)
+        lo = font.min_ch()
+        default = len(widths) - 1
         max = len(s)
         chunks = [ 0, ]
         end = 0
@@ -370,8 +1241,8 @@ class Draw565(object):
                     end = i
                     break
                 ch = s[i]
-                (_, h, w) = font.get_ch(ch)
-                l += w + 1
+                c = ord(ch) - lo
+                l += (widths[c] if 0 <= c < default else widths[default]) + 1
                 if l > width:
                     if end <= start:
                         end = i
@@ -408,9 +1279,13 @@ class Draw565(object):
         """
         if color is None:
             color = self._bgfg & 0xffff
-        px = bytes(((color >> 8) & 0xFF, color & 0xFF)) * (width * width)
-        write_data = self._display.write_data
-        set_window = self._display.set_window
+
+        if self._frame is not None:
+            dw = (width - 1) // 2
+            self._record((min(x0, x1) - dw, min(y0, y1) - dw,
+                          abs(x1 - x0) + width, abs(y1 - y0) + width, _OP_CALL,
+                          (self.line, (x0, y0, x1, y1, width, color))))
+            return
 
         dw = (width - 1) // 2
         x0 -= dw
@@ -431,9 +1306,19 @@ class Draw565(object):
             h = width if dy == 0 else (-dy + width)
             self.fill(color, x0, y0, w, h)
             return
+
+        # Walk the line (Bresenham) and record the left- and right-most
+        # pixel visited on each row
+        ymin = min(y0, y1)
+        rows = 1 - dy
+        lo = [ 0x7fff ] * rows
+        hi = [ -0x7fff ] * rows
         while True:
-            set_window(x0, y0, width, width)
-            write_data(px)
+            i = y0 - ymin
+            if x0 < lo[i]:
+                lo[i] = x0
+            if x0 > hi[i]:
+                hi[i] = x0
             if x0 == x1 and y0 == y1:
                 break
             e2 = 2 * err
@@ -441,9 +1326,52 @@ class Draw565(object):
                 err += dy
                 x0 += sx
             if e2 <= dx:
-                err += dx;
-                y0 += sy;
-        
+                err += dx
+                y0 += sy
+
+        self._spans(lo, hi, ymin, width, color)
+
+    @micropython.native
+    def _spans(self, lo, hi, ymin, width, color):
+        """Draw a thick line from the extents of each row of a thin line.
+
+        The line is drawn by sweeping a width x width square along the thin
+        line. Every scanline of the result is therefore a single span
+        covering the extents of the last width rows of the thin line. Each
+        span is emitted only once and consecutive identical spans (common for
+        steep lines) are combined into a single rectangle.
+        """
+        fill = self.fill
+        rows = len(lo)
+        start = 0
+        x = 0
+        w = 0
+
+        for r in range(rows + width - 1):
+            i = r - width + 1
+            if i < 0:
+                i = 0
+            j = r + 1
+            if j > rows:
+                j = rows
+            a = lo[i]
+            b = hi[i]
+            while i < j:
+                if lo[i] < a:
+                    a = lo[i]
+                if hi[i] > b:
+                    b = hi[i]
+                i += 1
+            b += width - a
+
+            if a != x or b != w:
+                if r:
+                    fill(color, x, ymin + start, w, r - start)
+                start = r
+                x = a
+                w = b
+        fill(color, x, ymin + start, w, rows + width - 1 - start)
+
     def polar(self, x, y, theta, r0, r1, width=1, color=None):
         """Draw a line using polar coordinates.
 
@@ -459,6 +1387,12 @@ class Draw565(object):
             draw = wasp.watch.drawable
             draw.line(360 / 12, 16, 64)
 
+        The angle is rounded to the nearest half degree and the end points
+        are calculated using integer lookup tables (see :py:func:`sin_q15`)
+        so passing an integer angle avoids floating point entirely. Use
+        :py:meth:`~.polar_half` to draw at half degree angles without
+        floating point.
+
         :param theta: Angle, in degrees
         :param r0: Radius of the start of the line
         :param y0: Radius of the end of the line
@@ -467,17 +1401,187 @@ class Draw565(object):
         :param width: Width of the line in pixels
         :param color: Colour to draw line in, defaults to the foreground colour
         """
-        to_radians = math.pi / 180
-        xdelta = math.sin(theta * to_radians)
-        ydelta = math.cos(theta * to_radians)
+        self.polar_half(x, y, round(2 * theta), r0, r1, width, color)
+
+    def polar_half(self, x, y, theta, r0, r1, width=1, color=None):
+        """Draw a line using polar coordinates with the angle in half degrees.
+
+        This is identical to :py:meth:`~.polar` except that theta is an
+        integer number of half degrees (e.g. 180 is 90 degrees). For
+        example, the hour hand of an analogue clock face is at
+        ``60 * (hours % 12) + minutes``.
+
+        :param int theta: Angle, in half degrees
+        """
+        xdelta = sin_q15(theta)
+        ydelta = cos_q15(theta)
 
-        x0 = x + int(xdelta * r0)
-        x1 = x + int(xdelta * r1)
-        y0 = y - int(ydelta * r0)
-        y1 = y - int(ydelta * r1)
+        x0 = x + mul_q15(xdelta, r0)
+        x1 = x + mul_q15(xdelta, r1)
+        y0 = y - mul_q15(ydelta, r0)
+        y1 = y - mul_q15(ydelta, r1)
 
         self.line(x0, y0, x1, y1, width, color)
 
+    def shapes(self, shapes, x, y, w, h):
+        """Draw a stack of filled shapes using a single window.
+
+        The shapes are rasterized one scanline at a time and clipped to the
+        rectangle (x, y, w, h). They are drawn in order on top of the
+        current background colour, which fills the rest of the rectangle.
+        Rectangles wider than the line buffer of the display need more than
+        one window.
+
+        Each shape is described by a tuple:
+
+        * ``(draw565.CIRCLE, color, x, y, r)``
+        * ``(draw565.RING, color, x, y, r0, r1, start, end)``
+        * ``(draw565.POLYGON, color, ((x0, y0), (x1, y1), ...))``
+
+        Example:
+
+        .. code-block:: python
+
+            # Progress ring, 3/4 complete, on a dark track
+            draw = wasp.watch.drawable
+            draw.shapes(((draw565.RING, 0x39e7, 120, 120, 100, 110, 0, 360),
+                         (draw565.RING, 0x07e0, 120, 120, 100, 110, 0, 270)),
+                        9, 9, 223, 223)
+
+        :param shapes: Sequence of shape descriptors
+        :param x:      X coordinate of the left-most pixels of the rectangle
+        :param y:      Y coordinate of the top-most pixels of the rectangle
+        :param w:      Width of the rectangle
+        :param h:      Height of the rectangle
+        """
+        if w <= 0 or h <= 0:
+            return
+        bg = self._bgfg >> 16
+        shapes = _compile_shapes(shapes)
+
+        if self._frame is not None:
+            self._record((x, y, w, h, _OP_SHAPES, (bg, shapes)))
+        else:
+            self._shapes(bg, shapes, x, y, w, h)
+
+    @micropython.native
+    def _shapes(self, bg, shapes, x, y, w, h):
+        """Draw a stack of compiled shapes (see :py:meth:`~.shapes`)."""
+        display = self._display
+        quick_write = display.quick_write
+
+        # Rectangles that are wider than the line buffer are drawn as
+        # several strips
+        strip = min(w, len(display.linebuffer) // 2)
+        for x0 in range(x, x + w, strip):
+            sw = min(strip, x + w - x0)
+            lines = len(display.linebuffer) // (2*sw)
+            buf = display.linebuffer[0:2*sw*lines]
+
+            display.set_window(x0, y, sw, h)
+            display.quick_start()
+            for row in range(y, y + h, lines):
+                n = min(lines, y + h - row)
+                _fill(buf, bg, sw*n, 0)
+                for line in range(n):
+                    _shape_row(buf, shapes, row + line, x0, sw, line*sw)
+                quick_write(buf if n == lines else buf[0:2*sw*n])
+            display.quick_end()
+
+    def circle(self, x, y, r, color=None):
+        """Draw a filled circle.
+
+        The bounding box of the circle is filled with the background
+        colour, see :py:meth:`~.shapes`.
+
+        :param x:     X coordinate of the centre
+        :param y:     Y coordinate of the centre
+        :param r:     Radius of the circle
+        :param color: Colour to draw in, defaults to the foreground colour
+        """
+        if color is None:
+            color = self._bgfg & 0xffff
+        d = 2*r + 1
+        self.shapes(((CIRCLE, color, x, y, r),), x - r, y - r, d, d)
+
+    def ring(self, x, y, r0, r1, start=0, end=360, color=None):
+        """Draw a filled ring or, if start and end are given, an arc.
+
+        Angles use the same navigational conventions as :py:meth:`~.polar`.
+        The bounding box of the arc is filled with the background colour,
+        see :py:meth:`~.shapes`.
+
+        :param x:     X coordinate of the centre
+        :param y:     Y coordinate of the centre
+        :param r0:    Inner radius
+        :param r1:    Outer radius
+        :param start: Angle, in degrees, at which the arc starts
+        :param end:   Angle, in degrees, at which the arc ends
+        :param color: Colour to draw in, defaults to the foreground colour
+        """
+        if color is None:
+            color = self._bgfg & 0xffff
+
+        # Find the extent of the arc from its end points together with any
+        # of the compass points that it sweeps past
+        start = int(start)
+        end = int(end)
+        if end < start:
+            end += 360
+        points = [ (start, r0), (start, r1), (end, r0), (end, r1) ]
+        if end - start >= 360:
+            points += [ (a, r1) for a in (0, 90, 180, 270) ]
+        else:
+            points += [ (a, r1) for a in range(start - start % 90 + 90, end, 90) ]
+        x0 = x1 = x
+        y0 = y1 = y
+        for (theta, r) in points:
+            px = x + mul_q15(sin_q15(2*theta), r)
+            py = y - mul_q15(cos_q15(2*theta), r)
+            x0 = min(x0, px)
+            x1 = max(x1, px)
+            y0 = min(y0, py)
+            y1 = max(y1, py)
+
+        # Allow for rounding in the end points (but never grow beyond the
+        # bounding box of the complete ring)
+        x0 = max(x0 - 1, x - r1)
+        y0 = max(y0 - 1, y - r1)
+        x1 = min(x1 + 1, x + r1)
+        y1 = min(y1 + 1, y + r1)
+        self.shapes(((RING, color, x, y, r0, r1, start, end),),
+                    x0, y0, x1 - x0 + 1, y1 - y0 + 1)
+
+    def triangle(self, x0, y0, x1, y1, x2, y2, color=None):
+        """Draw a filled triangle.
+
+        See :py:meth:`~.polygon`.
+
+        :param color: Colour to draw in, defaults to the foreground colour
+        """
+        self.polygon(((x0, y0), (x1, y1), (x2, y2)), color)
+
+    def polygon(self, points, color=None):
+        """Draw a filled convex polygon.
+
+        The vertices are given in the same coordinate system as
+        :py:meth:`~.fill` meaning the square with vertices (0, 0), (10, 0),
+        (10, 10) and (0, 10) is identical to ``fill(color, 0, 0, 10, 10)``.
+        The bounding box of the polygon is filled with the background
+        colour, see :py:meth:`~.shapes`.
+
+        :param points: Sequence of (x, y) vertices
+        :param color:  Colour to draw in, defaults to the foreground colour
+        """
+        if color is None:
+            color = self._bgfg & 0xffff
+        xs = [ p[0] for p in points ]
+        ys = [ p[1] for p in points ]
+        x = min(xs)
+        y = min(ys)
+        self.shapes(((POLYGON, color, points),),
+                    x, y, max(xs) - x, max(ys) - y)
+
     def lighten(self, color, step=1):
         """Get a lighter shade from the same palette.
 
@@ -522,3 +1626,121 @@ class Draw565(object):
         b = bm - step if bm > step else 0
 
         return (r | g | b)
+
+class _Tile(object):
+    """Display driver stand-in that renders into a pixel buffer.
+
+    Implements just enough of the :py:class:`~drivers.st7789.ST7789`
+    interface to act as the display for a :py:class:`Canvas`. Any pixels
+    that fall outside the tile are discarded.
+    """
+    def __init__(self, buf, width, height, linebuffer):
+        self.buf = memoryview(buf)
+        self.width = width
+        self.height = height
+        self.linebuffer = linebuffer
+        self.set_window(0, 0, width, height)
+
+    def set_window(self, x, y, width, height):
+        self._window = (x, width)
+        self._x = x
+        self._y = y
+
+    def rawblit(self, buf, x, y, width, height):
+        self.set_window(x, y, width, height)
+        self.write_data(buf)
+
+    def quick_start(self):
+        pass
+
+    def quick_end(self):
+        pass
+
+    @micropython.native
+    def quick_write(self, buf):
+        (wx, ww) = self._window
+        if ww <= 0:
+            return
+        tile = self.buf
+        tw = self.width
+        th = self.height
+        x = self._x
+        y = self._y
+
+        # Copy the data one (clipped) row of the window at a time
+        i = 0
+        n = len(buf) // 2
+        while i < n:
+            run = min(wx + ww - x, n - i)
+            if 0 <= y and y < th:
+                a = max(x, 0)
+                b = min(x + run, tw)
+                if a < b:
+                    p = 2 * (y*tw + a)
+                    q = 2 * (i + a - x)
+                    tile[p:p + 2*(b-a)] = buf[q:q + 2*(b-a)]
+            i += run
+            x += run
+            if x >= wx + ww:
+                x = wx
+                y += 1
+
+        self._x = x
+        self._y = y
+
+    def write_data(self, buf):
+        self.quick_write(buf)
+
+class Canvas(Draw565):
+    """Off-screen drawing surface.
+
+    A canvas provides the same drawing API as :py:class:`Draw565` but draws
+    into a caller-supplied RGB565 pixel buffer (a tile) instead of the
+    display. Overlapping elements, such as a label on top of a button, can
+    be composed without any overdraw on the display and the finished tile
+    is sent to the display in a single transfer.
+
+    Example:
+
+    .. code-block:: python
+
+        draw = wasp.watch.drawable
+        canvas = draw565.Canvas(draw, bytearray(2 * 240 * 40), 240, 40)
+        canvas.fill(0x001f)
+        canvas.set_color(0xffff, 0x001f)
+        canvas.string('Hello', 0, 8, width=240)
+        canvas.flush(0, 100)
+
+    .. automethod:: __init__
+    """
+    def __init__(self, drawable, buf, width, height):
+        """Create a canvas.
+
+        The canvas shares the glyph and image caches of the drawable and,
+        when it is wide enough, borrows its line buffer.
+
+        :param drawable: :py:class:`Draw565` instance whose display the
+                         canvas will be flushed to
+        :param buf:      Pixel buffer, at least 2*width*height bytes long
+        :param width:    Width of the canvas
+        :param height:   Height of the canvas
+        """
+        display = drawable._display
+        linebuffer = display.linebuffer
+        if len(linebuffer) < 2 * width:
+            linebuffer = memoryview(bytearray(2 * width))
+
+        super().__init__(_Tile(buf, width, height, linebuffer))
+        self.glyph_cache = drawable.glyph_cache
+        self.image_cache = drawable.image_cache
+        self._target = display
+
+    def flush(self, x, y):
+        """Send the contents of the canvas to the display.
+
+        :param x: X coordinate for the left-most pixels of the canvas
+        :param y: Y coordinate for the top-most pixels of the canvas
+        """
+        tile = self._display
+        self._target.rawblit(tile.buf[0:2*tile.width*tile.height], x, y,
+                             tile.width, tile.height)
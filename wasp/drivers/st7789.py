@@ -20,6 +20,7 @@ from time import sleep_ms
 _SWRESET            = const(0x01)
 _SLPIN              = const(0x10)
 _SLPOUT             = const(0x11)
+_PTLON              = const(0x12)
 _NORON              = const(0x13)
 _INVOFF             = const(0x20)
 _INVON              = const(0x21)
@@ -28,6 +29,11 @@ _DISPON             = const(0x29)
 _CASET              = const(0x2a)
 _RASET              = const(0x2b)
 _RAMWR              = const(0x2c)
+_PTLAR              = const(0x30)
+_VSCRDEF            = const(0x33)
+_VSCSAD             = const(0x37)
+_IDMOFF             = const(0x38)
+_IDMON              = const(0x39)
 _COLMOD             = const(0x3a)
 _MADCTL             = const(0x36)
 
@@ -36,15 +42,18 @@ class ST7789(object):
 
     .. automethod:: __init__
     """
-    def __init__(self, width, height):
+    def __init__(self, width, height, lines=1):
         """Configure the size of the display.
 
         :param int width: Display width, in pixels
         :param int height: Display height in pixels
+        :param int lines: Height, in rows, of the line buffer. A taller
+                          line buffer costs RAM but allows drawing
+                          operations to send several rows per SPI write.
         """
         self.width = width
         self.height = height
-        self.linebuffer = memoryview(bytearray(2 * width))
+        self.linebuffer = memoryview(bytearray(2 * width * lines))
         self.window = bytearray(4)
         self.init_display()
 
@@ -55,16 +64,21 @@ class ST7789(object):
         self.write_cmd(_SLPOUT)
         sleep_ms(10)
 
+        # MCU will send 16-bit RGB565 (until told otherwise)
+        self._depth = None
+        self.set_depth(16)
+
         for cmd in (
-            (_COLMOD,   b'\x05'), # MCU will send 16-bit RGB565
             (_MADCTL,   b'\x00'), # Left to right, top to bottom
             #(_INVOFF,   None), # Results in odd palette
             (_INVON,   None),
             (_NORON,   None),
         ):
-            self.write_cmd(cmd[0])
-            if cmd[1]:
-                self.write_data(cmd[1])
+            self.write_cmd(cmd[0], cmd[1])
+
+        # The window registers have been reset so they must be sent again
+        self._cols = None
+        self._rows = None
         self.fill(0)
         self.write_cmd(_DISPON)
 
@@ -106,12 +120,108 @@ class ST7789(object):
         else:
             self.write_cmd(_DISPON)
 
+    def partial(self, start=None, end=None):
+        """Enter (or leave) partial display mode.
+
+        In partial mode only the rows from start to end (inclusive) are
+        refreshed from the frame memory, the rest of the panel is blank.
+        Combined with :py:meth:`~.idle` this allows a small part of the
+        display to stay visible at a much lower power cost than normal
+        operation.
+
+        :param int start: First row of the partial area, or None to return to
+                          normal mode
+        :param int end:   Last row of the partial area
+        """
+        if start is None:
+            self.write_cmd(_NORON)
+            return
+
+        self.write_cmd(_PTLAR,
+                       bytes((start >> 8, start & 0xff, end >> 8, end & 0xff)))
+        self.write_cmd(_PTLON)
+
+    def idle(self, idle):
+        """Enter (or leave) idle mode.
+
+        In idle mode the display only shows 8 colours (the most significant
+        bit of each of red, green and blue) which reduces power consumption.
+        The frame memory is not changed.
+
+        :param bool idle: True to enter idle mode, False for full colour.
+        """
+        if idle:
+            self.write_cmd(_IDMON)
+        else:
+            self.write_cmd(_IDMOFF)
+
+    def set_depth(self, depth):
+        """Select the format of the pixel data sent to the display.
+
+        At 16 bits per pixel (the default) every pixel is sent as two bytes
+        of RGB565. At 12 bits per pixel pairs of pixels are packed into three
+        bytes of RGB444 (``RRRRGGGG BBBBrrrr ggggbbbb``), which cuts the
+        amount of data that must be sent by a quarter. The frame memory is not
+        affected so the format can be switched freely between writes.
+
+        The format is only sent to the display when it changes.
+
+        :param int depth: Bits per pixel, either 12 or 16
+        """
+        if depth != self._depth:
+            self._depth = depth
+            self.write_cmd(_COLMOD, b'\x03' if depth == 12 else b'\x05')
+
+    def set_scroll_area(self, top=0, height=320, bottom=0):
+        """Define the vertical scrolling area.
+
+        The frame memory of the ST7789 has 320 rows, of which only the first
+        240 are visible. It is split into a fixed area at the top, a
+        scrolling area and a fixed area at the bottom. Together these must
+        cover all 320 rows. The default is to scroll the whole of the frame
+        memory.
+
+        :param int top:    Height of the top fixed area
+        :param int height: Height of the scrolling area
+        :param int bottom: Height of the bottom fixed area
+        """
+        self.write_cmd(_VSCRDEF, bytes((top >> 8, top & 0xff,
+                                        height >> 8, height & 0xff,
+                                        bottom >> 8, bottom & 0xff)))
+
+    def scroll(self, line):
+        """Scroll the display.
+
+        Rows are not moved within the frame memory. Instead this changes
+        which row of the frame memory is shown at the top of the scrolling
+        area and drawing must continue to use frame memory coordinates.
+        Scrolling by a few rows therefore only requires the newly exposed
+        rows to be drawn (ideally before they become visible).
+
+        Example:
+
+        .. code-block:: python
+
+            # Scroll by one 24 pixel line of text (with a 312 row
+            # scrolling area there are 72 hidden rows to draw into)
+            display.set_scroll_area(0, 312, 8)
+            draw.string('Next line', 0, 240, width=240)
+            display.scroll(24)
+
+        :param int line: Row of the frame memory to show at the top of the
+                         scrolling area, use 0 to restore normal operation.
+        """
+        self.write_cmd(_VSCSAD, bytes((line >> 8, line & 0xff)))
+
     @micropython.native
     def set_window(self, x, y, width, height):
         """Set the clipping rectangle.
 
         All writes to the display will be wrapped at the edges of the rectangle.
 
+        The driver remembers the current window so the column and row
+        addresses are only sent to the display when they change.
+
         :param x:  X coordinate of the left-most pixels of the rectangle
         :param y:  Y coordinate of the top-most pixels of the rectangle
         :param w:  Width of the rectangle, defaults to None (which means select
@@ -121,24 +231,27 @@ class ST7789(object):
         """
         write_cmd = self.write_cmd
         window = self.window
-        write_data = self.write_data
 
         xp = x + width - 1
         yp = y + height - 1
 
-        write_cmd(_CASET)
-        window[0] = x >> 8
-        window[1] = x & 0xff
-        window[2] = xp >> 8
-        window[3] = xp & 0xff
-        write_data(window)
-
-        write_cmd(_RASET)
-        window[0] = y >> 8
-        window[1] = y & 0xff
-        window[2] = yp >> 8
-        window[3] = yp & 0xff
-        write_data(window)
+        cols = (x << 16) | (xp & 0xffff)
+        if cols != self._cols:
+            self._cols = cols
+            window[0] = x >> 8
+            window[1] = x & 0xff
+            window[2] = xp >> 8
+            window[3] = xp & 0xff
+            write_cmd(_CASET, window)
+
+        rows = (y << 16) | (yp & 0xffff)
+        if rows != self._rows:
+            self._rows = rows
+            window[0] = y >> 8
+            window[1] = y & 0xff
+            window[2] = yp >> 8
+            window[3] = yp & 0xff
+            write_cmd(_RASET, window)
 
         write_cmd(_RAMWR)
 
@@ -176,15 +289,18 @@ class ST7789(object):
             h = self.height - y
         self.set_window(x, y, w, h)
 
-        # Populate the line buffer
-        buf = self.linebuffer[0:2*w]
-        for xi in range(0, 2*w, 2):
+        # Populate the line buffer (as many whole rows as will fit)
+        lines = max(1, len(self.linebuffer) // (2*w))
+        buf = self.linebuffer[0:2*w*lines]
+        for xi in range(0, len(buf), 2):
             buf[xi] = bg >> 8
             buf[xi+1] = bg & 0xff
 
         # Do the fill
-        for yi in range(h):
+        for yi in range(0, h - lines + 1, lines):
             self.write_data(buf)
+        if h % lines:
+            self.write_data(buf[0:2*w*(h % lines)])
 
 class ST7789_SPI(ST7789):
     """
@@ -195,7 +311,8 @@ class ST7789_SPI(ST7789):
         :param bytes-like buf: Data, must be in a form that can be directly
                                consumed by the SPI bus.
     """
-    def __init__(self, width, height, spi, cs, dc, res=None, rate=8000000):
+    def __init__(self, width, height, spi, cs, dc, res=None, rate=8000000,
+                 lines=1):
         """Configure the display.
 
         :param int width: Width of the display
@@ -207,6 +324,7 @@ class ST7789_SPI(ST7789):
         :param machine.Pin res: Pin (or signal) to, optionally, use to reset
                                 the display.
         :param int rate: SPI bus frequency
+        :param int lines: Height, in rows, of the line buffer
         """
         self.quick_write = spi.write
         self.cs = cs.value
@@ -221,7 +339,7 @@ class ST7789_SPI(ST7789):
         if res:
             res.init(res.OUT, value=0)
 
-        super().__init__(width, height)
+        super().__init__(width, height, lines)
 
     def reset(self):
         """Reset the display.
@@ -238,11 +356,16 @@ class ST7789_SPI(ST7789):
         sleep_ms(125)
 
     @micropython.native
-    def write_cmd(self, cmd):
-        """Send a command opcode to the display.
+    def write_cmd(self, cmd, params=None):
+        """Send a command opcode, and optionally its parameters, to the display.
+
+        The command and its parameters are sent using a single chip select
+        cycle.
 
         :param sequence cmd: Command, will be automatically converted so it can
                              be issued to the SPI bus.
+        :param bytearray params: Parameters for the command, must be in a form
+                                 that can be directly consumed by the SPI bus.
         """
         dc = self.dc
         cs = self.cs
@@ -252,8 +375,10 @@ class ST7789_SPI(ST7789):
         cs(0)
         c[0] = cmd
         self.quick_write(c)
-        cs(1)
         dc(1)
+        if params:
+            self.quick_write(params)
+        cs(1)
 
     @micropython.native
     def write_data(self, buf):
@@ -6,15 +6,42 @@ import fonts.sans24 as sans24
 import fonts.sans28 as sans28
 import fonts.sans36 as sans36
 
+_widths = {}
+
 def height(font):
     return font.height()
 
+def widths(font):
+    """Get the advance width table for a font.
+
+    The table is built on first use and holds the width of every glyph from
+    font.min_ch() to font.max_ch() followed by the width of the glyph used
+    for characters outside of that range. The advance of each character is
+    one pixel wider than its glyph (see :py:func:`width`).
+    """
+    try:
+        return _widths[font]
+    except KeyError:
+        pass
+
+    lo = font.min_ch()
+    hi = font.max_ch()
+    get_ch = font.get_ch
+    table = bytearray(hi - lo + 2)
+    for i in range(hi - lo + 1):
+        table[i] = get_ch(chr(lo + i))[2]
+    table[-1] = get_ch(chr(hi + 1))[2]
+    _widths[font] = table
+
+    return table
+
 def width(font, s):
-    w = 0
+    table = widths(font)
+    lo = font.min_ch()
+    n = len(table) - 1
+    w = len(s)
     for ch in s:
-        (_, _, wc) = font.get_ch(ch)
-        w += wc + 1
+        i = ord(ch) - lo
+        w += table[i] if 0 <= i < n else table[n]
 
     return w
-
-
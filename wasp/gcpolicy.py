@@ -0,0 +1,157 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2026 agent
+
+"""Garbage collection policy
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+A full mark and sweep of the heap is expensive so, rather than collecting
+on every tick, the system manager asks the policy to decide. The policy
+collects when enough memory has been allocated since the last collection,
+when free memory is running low and just before the watch goes to sleep.
+
+If free memory is still low after a collection then the low memory
+callbacks are run. They run once each time free memory drops below the
+low water mark, rather than on every tick, so the policy does not thrash
+whilst memory stays low. The callbacks allow applications to release
+memory that can easily be recreated, such as caches:
+
+.. code-block:: python
+
+    def _drop_cache(self):
+        self._cache = None
+
+    wasp.system.gc.register(self._drop_cache)
+"""
+
+import gc
+import time
+
+if 'ticks_us' in dir(time):
+    def _ticks_us():
+        return time.ticks_us()
+
+    def _ticks_diff(end, start):
+        return time.ticks_diff(end, start)
+else:
+    def _ticks_us():
+        return int(time.time() * 1000000)
+
+    def _ticks_diff(end, start):
+        return end - start
+
+class GCPolicy():
+    """Decide when to run the garbage collector.
+
+    .. data:: collections
+
+        Number of collections run by the policy.
+
+    .. data:: time_us
+
+        Total time spent in collections run by the policy, in microseconds.
+
+    .. data:: peak
+
+        Largest amount of heap in use that the policy has observed, in bytes.
+
+    .. automethod:: __init__
+    """
+    def __init__(self, threshold=4096, low_water=8192):
+        """Configure the policy.
+
+        If the heap cannot be measured (for example, on the simulator) then
+        the policy collects every time it is asked.
+
+        :param int threshold: Collect once this many bytes have been
+                              allocated since the last collection
+        :param int low_water: Collect (and then run the low memory
+                              callbacks) if fewer than this many bytes of the
+                              heap are free
+        """
+        self.threshold = threshold
+        self.low_water = low_water
+        self.collections = 0
+        self.time_us = 0
+        self.peak = 0
+        self._callbacks = []
+        self._low = False
+
+        if 'mem_alloc' in dir(gc):
+            self._mem_alloc = gc.mem_alloc
+            self._mem_free = gc.mem_free
+        else:
+            self._mem_alloc = None
+            self._mem_free = None
+        self._baseline = self._alloc()
+
+    def _alloc(self):
+        return self._mem_alloc() if self._mem_alloc else 0
+
+    def register(self, callback):
+        """Register a function to call when memory is low.
+
+        :param function callback: Function (taking no arguments) that
+                                  releases memory
+        """
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+
+    def unregister(self, callback):
+        """Unregister a low memory callback."""
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def tick(self):
+        """Collect, but only if the policy says it is needed.
+
+        :returns: True if a collection was run
+        """
+        if not self._mem_alloc:
+            self.collect()
+            return True
+
+        alloc = self._mem_alloc()
+        if alloc > self.peak:
+            self.peak = alloc
+        if alloc - self._baseline < self.threshold and \
+                (self._low or self._mem_free() >= self.low_water):
+            return False
+
+        self.collect()
+        return True
+
+    def collect(self):
+        """Run a collection (and, if needed, the low memory callbacks).
+
+        The low memory callbacks are only run if free memory has dropped
+        below the low water mark since they were last run.
+        """
+        self._collect()
+        if self._mem_free:
+            if self._mem_free() >= self.low_water:
+                self._low = False
+            elif not self._low:
+                self.low_memory()
+
+    def low_memory(self):
+        """Ask everything that registered a callback to release memory.
+
+        The low memory callbacks are run and then the heap is collected
+        again. This is also useful after a MemoryError has been caught.
+        """
+        self._low = True
+        for callback in self._callbacks:
+            callback()
+        self._collect()
+
+    def _collect(self):
+        if self._mem_alloc:
+            alloc = self._mem_alloc()
+            if alloc > self.peak:
+                self.peak = alloc
+
+        start = _ticks_us()
+        gc.collect()
+        self.time_us += _ticks_diff(_ticks_us(), start)
+        self.collections += 1
+        self._baseline = self._alloc()
@@ -14,7 +14,9 @@
     wasp.watch is an import of :py:mod:`watch` and is simply provided as a
     shortcut (and to reduce memory by keeping it out of other namespaces).
 """
+import array
 import gc
+import gcpolicy
 import machine
 import micropython
 import steplogger
@@ -51,43 +53,281 @@ class EventMask():
     BUTTON = 0x0008
     NEXT = 0x0010
 
+# Event type used to queue button changes (touch events use the gesture
+# codes reported by the touch controller)
+_BUTTON = 0x100
+
+# Interval, in milliseconds, at which a sleeping watch checks for changes
+# that do not raise an interrupt (such as the charger being connected)
+_POLL_MS = 1000
+
+class EventQueue():
+    """Fixed size ring buffer of input events.
+
+    Events are queued by interrupt handlers and are drained by the system
+    manager. The queue is allocated up front so that queuing an event
+    does not allocate any memory. If the queue is full then new events are
+    dropped (and counted).
+
+    Each event consists of the event type, x and y coordinates and a
+    timestamp (the bottom 16 bits of the uptime in milliseconds).
+    """
+
+    def __init__(self, size=8):
+        """
+        :param int size: Number of slots in the queue (one slot is always
+                         kept free)
+        """
+        self._events = array.array('H', bytes(8 * size))
+        self._size = size
+        self._head = 0
+        self._tail = 0
+        self.dropped = 0
+
+    def put(self, kind, x, y):
+        """Queue an event (may be called from an interrupt handler)."""
+        tail = self._tail
+        nxt = tail + 1
+        if nxt == self._size:
+            nxt = 0
+        if nxt == self._head:
+            self.dropped += 1
+            return
+
+        events = self._events
+        i = 4 * tail
+        events[i] = kind
+        events[i+1] = x
+        events[i+2] = y
+        events[i+3] = watch.rtc.get_uptime_ms() & 0xffff
+        self._tail = nxt
+
+    def peek(self):
+        """Get the type of the oldest event without removing it.
+
+        :return: The event type, or None if the queue is empty.
+        """
+        if self._head == self._tail:
+            return None
+        return self._events[4 * self._head]
+
+    def get(self, event):
+        """Remove the oldest event from the queue.
+
+        :param array event: Four element array to copy the event into
+        :return: True if an event was copied, False if the queue was empty.
+        """
+        head = self._head
+        if head == self._tail:
+            return False
+
+        events = self._events
+        i = 4 * head
+        event[0] = events[i]
+        event[1] = events[i+1]
+        event[2] = events[i+2]
+        event[3] = events[i+3]
+        head += 1
+        self._head = 0 if head == self._size else head
+        return True
+
+    def clear(self):
+        """Discard every queued event."""
+        self._head = self._tail
+
 class PinHandler():
     """Pin (and Signal) event generator.
 
+    If the pin supports interrupts then every change is also queued so
+    that short presses are not lost between ticks.
+
     TODO: Currently this driver doesn't actually implement any
     debounce but it will!
     """
 
-    def __init__(self, pin):
+    def __init__(self, pin, queue=None):
         """
         :param Pin pin: The pin to generate events from
+        :param EventQueue queue: Queue for changes reported by interrupt
         """
         self._pin = pin
         self._value = pin.value()
+        if queue is not None and hasattr(pin, 'irq'):
+            self._queue = queue
+            pin.irq(trigger=machine.Pin.IRQ_FALLING|machine.Pin.IRQ_RISING,
+                    handler=self._irq)
+
+    def _irq(self, pin):
+        self._queue.put(_BUTTON, 1 if pin.value() else 0, 0)
 
-    def get_event(self):
+    def get_event(self, value=None):
         """Receive a pin change event.
 
         Check for a pending pin change event and, if an event is pending,
         return it.
 
+        :param value: Pin state reported by an interrupt, defaults to None
+                      (which means read the pin)
         :return: boolean of the pin state if an event is received, None
                  otherwise.
         """
-        new_value = self._pin.value()
+        new_value = self._pin.value() if value is None else value
         if self._value == new_value:
             return None
 
         self._value = new_value
         return new_value
 
+    def pending(self):
+        """Check for a pending pin change event without consuming it.
+
+        :return: True if :py:meth:`~.get_event` would report an event.
+        """
+        return self._pin.value() != self._value
+
 def _key_app(d):
     """Get a sort key for apps."""
     return d.NAME
 
-def _key_alarm(d):
-    """Get a sort key for alarms."""
-    return d[0]
+def _earliest(a, b):
+    """Find the earliest of two deadlines (either of which may be None)."""
+    if a is None or (b is not None and b < a):
+        return b
+    return a
+
+def _before(a, b):
+    """Compare two alarms (ties are broken by the order they were queued)."""
+    return a[0] < b[0] or (a[0] == b[0] and a[1] < b[1])
+
+def _heappush(heap, item):
+    """Add an item to a binary heap."""
+    heap.append(item)
+    i = len(heap) - 1
+    while i:
+        parent = (i - 1) >> 1
+        if not _before(item, heap[parent]):
+            break
+        heap[i] = heap[parent]
+        i = parent
+    heap[i] = item
+
+def _heappop(heap):
+    """Remove, and return, the smallest item from a binary heap."""
+    item = heap.pop()
+    if not heap:
+        return item
+    head = heap[0]
+    _siftdown(heap, 0, item)
+    return head
+
+def _siftdown(heap, i, item):
+    """Move an item down the heap from position i until the heap is valid."""
+    n = len(heap)
+    while True:
+        child = 2 * i + 1
+        if child >= n:
+            break
+        if child + 1 < n and _before(heap[child + 1], heap[child]):
+            child += 1
+        if not _before(heap[child], item):
+            break
+        heap[i] = heap[child]
+        i = child
+    heap[i] = item
+
+def _heapify(heap):
+    """Rearrange a list into a binary heap."""
+    for i in range(len(heap) // 2 - 1, -1, -1):
+        _siftdown(heap, i, heap[i])
+
+def _import_app(path):
+    """Import an application module and find the application class.
+
+    :param str path: Module and class name, such as ``apps.calc.CalculatorApp``
+    :returns: The application class
+    """
+    ns = {}
+    exec('import ' + path[:path.rindex('.')], ns)
+    return eval(path, ns)
+
+def _unload_module(path):
+    """Remove the module containing an application from memory.
+
+    The module can only be freed once nothing else refers to it.
+    """
+    modname = path[:path.rindex('.')]
+    if modname in sys.modules:
+        exec('import {0}\ndel {0}'.format(modname), {})
+        del sys.modules[modname]
+
+class LazyApp():
+    """Application that is only loaded when it is first needed.
+
+    Until it is brought to the foreground the placeholder only keeps the
+    application's NAME and ICON (which is enough for the launcher). Once
+    loaded the application instance is kept unless ``unload`` is set, in
+    which case the instance is released, and its module removed from
+    ``sys.modules``, every time it is sent to the background.
+
+    Applications that are unloaded can keep some of their state by
+    listing the attributes to preserve in ``PERSIST``:
+
+    .. code-block:: python
+
+        class CounterApp():
+            NAME = 'Counter'
+            PERSIST = ('count',)
+
+    .. automethod:: __init__
+    """
+    def __init__(self, path, unload=False):
+        """Create a placeholder for an application.
+
+        The module is imported, briefly, to find the application metadata.
+
+        :param str path: Module and class name of the application
+        :param bool unload: Release the application whenever it is sent to
+                            the background
+        """
+        # Modules that were already imported by someone else cannot be
+        # freed (and unloading them would give us a different class)
+        self._resident = path[:path.rindex('.')] in sys.modules
+        cls = _import_app(path)
+        self.NAME = cls.NAME
+        if 'ICON' in dir(cls):
+            self.ICON = cls.ICON
+        self.cls_name = cls.__name__
+        self.step_counter = issubclass(cls, StepCounterApp)
+        self.path = path
+        self.unload = unload
+        self.instance = None
+        self._state = None
+        del cls
+        if not self._resident:
+            _unload_module(path)
+
+    def load(self):
+        """Get the application, importing and constructing it if needed."""
+        app = self.instance
+        if app is None:
+            app = _import_app(self.path)()
+            if self._state:
+                for (attr, value) in self._state:
+                    setattr(app, attr, value)
+                self._state = None
+            self.instance = app
+        return app
+
+    def release(self):
+        """Release the application (keeping any persistent state)."""
+        app = self.instance
+        if app is None:
+            return
+        if 'PERSIST' in dir(app):
+            self._state = [ (attr, getattr(app, attr)) for attr in app.PERSIST ]
+        self.instance = None
+        if not self._resident:
+            _unload_module(self.path)
 
 class Manager():
     """Wasp-os system manager
@@ -102,6 +342,7 @@ class Manager():
 
     def __init__(self):
         self.app = None
+        self._entry = None
 
         self.bar = widgets.StatusBar()
 
@@ -135,8 +376,12 @@ class Manager():
         )
 
         self.blank_after = 15
+        self.always_on = False
+        self._ambient = None
 
         self._alarms = []
+        self._alarm_seq = 0
+        self._alarm_cancelled = 0
         self._brightness = 2
         self._notifylevel = 2
         if 'P8' in watch.os.uname().machine:
@@ -144,7 +389,14 @@ class Manager():
         else:
             self._nfylevels = [0, 40, 80]
         self._nfylev_ms = self._nfylevels[self._notifylevel - 1]
-        self._button = PinHandler(watch.button)
+        self.gc = gcpolicy.GCPolicy()
+        self.gc.register(self._drop_caches)
+        self._events = EventQueue()
+        self._event = array.array('H', (0, 0, 0, 0))
+        self._button = PinHandler(watch.button, self._events)
+        if 'touch' in dir(watch):
+            self._touch_schedule = watch.touch.schedule
+            watch.touch.schedule = self._touch_irq
         self._charging = True
         self._scheduled = False
         self._scheduling = False
@@ -178,18 +430,41 @@ class Manager():
         # self.register('apps.heart.HeartApp', no_except=True)
         # self.register('apps.steps.StepCounterApp', no_except=True)
         # self.register('apps.stopwatch.StopwatchApp', no_except=True)
-        self.register('apps.settings.SettingsApp', no_except=True)
-        self.register('apps.software.SoftwareApp', no_except=True)
+        self.register('apps.settings.SettingsApp', no_except=True, lazy=True)
+        self.register('apps.software.SoftwareApp', no_except=True, unload=True)
 
-    def register(self, app, quick_ring=False, watch_face=False, no_except=False):
+    def register(self, app, quick_ring=False, watch_face=False, no_except=False,
+                 lazy=False, unload=False):
         """Register an application with the system.
 
         :param object app: The application to register
         :param object quick_ring: Place the application on the quick ring
         :param object watch_face: Make the new application the default watch face
         :param object no_except: Ignore exceptions when instantiating applications
+        :param object lazy: Do not construct the application until it is
+                            first used (app must be a string), see
+                            :py:class:`LazyApp`
+        :param object unload: Release a lazy application whenever it is sent
+                              to the background
+
+        Step counter applications (subclasses of ``StepCounterApp``) are
+        always constructed when they are registered and are never released,
+        even if lazy or unload is set. Constructing the step counter resets
+        the step count, so it must happen once, at start up, and the step
+        logger needs the application from then on.
         """
-        if isinstance(app, str):
+        if isinstance(app, str) and (lazy or unload):
+            try:
+                app = LazyApp(app, unload)
+
+                # Step counters cannot be lazy (see above)
+                if app.step_counter:
+                    app = app.load()
+            except:
+                if not no_except:
+                    raise
+                return
+        elif isinstance(app, str):
             modname = app[:app.rindex('.')]
             exec('import ' + modname)
             if no_except:
@@ -220,7 +495,8 @@ class Manager():
 
     def unregister(self, cls):
         for app in self.launcher_ring:
-            if isinstance(app, cls):
+            if isinstance(app, cls) or \
+                    (isinstance(app, LazyApp) and app.cls_name == cls.__name__):
                 self.launcher_ring.remove(app)
                 break
 
@@ -251,7 +527,10 @@ class Manager():
 
     def switch(self, app):
         """Switch to the requested application.
+
+        :param object app: The application, or a :py:class:`LazyApp` to load
         """
+        entry = app
         if self.app:
             if 'background' in dir(self.app):
                 try:
@@ -265,6 +544,16 @@ class Manager():
                     self.app = True
                     raise
 
+        # Release the old application (if it was loaded on demand) before
+        # the new one is loaded so that both are never in memory together
+        old = self._entry
+        if old is not entry and isinstance(old, LazyApp) and old.unload:
+            self.app = True
+            old.release()
+        self._entry = entry
+        if isinstance(app, LazyApp):
+            app = app.load()
+
         # Clear out any configuration from the old application
         self.event_mask = 0
         self.tick_period_ms = 0
@@ -291,18 +580,19 @@ class Manager():
         :param int direction: The direction of the navigation
         """
         app_list = self.quick_ring
+        current = self._entry
 
         if direction == EventType.LEFT:
-            if self.app in app_list:
-                i = app_list.index(self.app) + 1
+            if current in app_list:
+                i = app_list.index(current) + 1
                 if i >= len(app_list):
                     i = 0
             else:
                 i = 0
             self.switch(app_list[i])
         elif direction == EventType.RIGHT:
-            if self.app in app_list:
-                i = app_list.index(self.app) - 1
+            if current in app_list:
+                i = app_list.index(current) - 1
                 if i < 0:
                     i = len(app_list)-1
             else:
@@ -311,7 +601,7 @@ class Manager():
         elif direction == EventType.UP:
             self.switch(self.launcher)
         elif direction == EventType.DOWN:
-            if self.app != app_list[0]:
+            if current != app_list[0]:
                 self.switch(app_list[0])
             else:
                 if len(self.notifications):
@@ -322,7 +612,7 @@ class Manager():
                     watch.vibrator.pulse()
 
         elif direction == EventType.HOME or direction == EventType.BACK:
-            if self.app != app_list[0]:
+            if current != app_list[0]:
                 self.switch(app_list[0])
             else:
                 self.sleep()
@@ -346,18 +636,50 @@ class Manager():
     def set_alarm(self, time, action):
         """Queue an alarm.
 
+        Alarms are kept in a binary heap ordered by their expiry time (alarms
+        that expire at the same time run in the order they were queued).
+
         :param int time: Time to trigger the alarm (use time.mktime)
         :param function action: Action to perform when the alarm expires.
+        :returns: A handle that can be passed to :py:meth:`~.cancel_alarm`
         """
-        self._alarms.append((time, action))
-        self._alarms.sort(key = _key_alarm)
-
-    def cancel_alarm(self, time, action):
-        """Unqueue an alarm."""
-        try:
-            self._alarms.remove((time, action))
-        except:
-            return False
+        alarm = [time, self._alarm_seq, action]
+        self._alarm_seq += 1
+        _heappush(self._alarms, alarm)
+        return alarm
+
+    def cancel_alarm(self, time, action=None):
+        """Unqueue an alarm.
+
+        The alarm can be identified either by the handle returned by
+        :py:meth:`~.set_alarm` (which is quick) or by the time and action
+        it was queued with (which requires a search of the queue).
+
+        :param time: Alarm handle, or the time the alarm was queued for
+        :param function action: Action the alarm was queued with (only
+                                needed when time is not a handle)
+        :returns: True if the alarm was pending, otherwise False
+        """
+        alarms = self._alarms
+        if action is None:
+            alarm = time
+            if alarm[2] is None:
+                return False
+        else:
+            for alarm in alarms:
+                if alarm[0] == time and alarm[2] == action:
+                    break
+            else:
+                return False
+
+        # Cancelled alarms are left in the queue (and discarded when they
+        # reach the head) unless they start to make up most of the queue
+        alarm[2] = None
+        self._alarm_cancelled += 1
+        if 2 * self._alarm_cancelled > len(alarms):
+            alarms[:] = [ a for a in alarms if a[2] is not None ]
+            _heapify(alarms)
+            self._alarm_cancelled = 0
         return True
 
     def request_event(self, event_mask):
@@ -382,21 +704,54 @@ class Manager():
 
     def sleep(self):
         """Enter the deepest sleep state possible.
+
+        If ``always_on`` is set and the application (after switching
+        to the default watch face if needed) provides an ``ambient()``
+        method then the display is not switched off. Instead ``ambient()``
+        is asked to draw a reduced watch face, which is kept visible using
+        the partial and idle modes of the display and redrawn once a
+        minute. ``ambient()`` must return the rows it uses as (y, h).
         """
         watch.backlight.set(0)
         if 'sleep' not in dir(self.app) or not self.app.sleep():
             self.switch(self.quick_ring[0])
             self.app.sleep()
-        watch.display.poweroff()
+        if self.always_on and 'ambient' in dir(self.app):
+            self._ambient = watch.rtc.time() // 60
+            self._update_ambient()
+            watch.display.idle(True)
+            watch.backlight.set(1)
+        else:
+            watch.display.poweroff()
         watch.touch.sleep()
+        self._events.clear()
         self._charging = watch.battery.charging()
         self.sleep_at = None
+        self.gc.collect()
+
+    def _drop_caches(self):
+        """Empty the drawing caches (called when memory is low)."""
+        draw = watch.drawable
+        if draw.glyph_cache:
+            draw.glyph_cache.clear()
+        if draw.image_cache:
+            draw.image_cache.clear()
+
+    def _update_ambient(self):
+        """Redraw the always-on display."""
+        (y, h) = self.app.ambient()
+        watch.display.partial(y, y + h - 1)
 
     def wake(self):
         """Return to a running state.
         """
         if not self.sleep_at:
-            watch.display.poweron()
+            if self._ambient is None:
+                watch.display.poweron()
+            else:
+                self._ambient = None
+                watch.display.idle(False)
+                watch.display.partial()
             if 'wake' in dir(self.app):
                 self.app.wake()
             watch.backlight.set(self._brightness)
@@ -404,6 +759,41 @@ class Manager():
 
         self.keep_awake()
 
+    def _touch_irq(self, touch):
+        """Queue a touch event (called by the touch driver's interrupt)."""
+        event = touch.get_event()
+        if event:
+            self._events.put(event[0], event[1], event[2])
+            touch.reset_touch_data()
+        if self._touch_schedule:
+            self._touch_schedule(touch)
+
+    def _handle_events(self):
+        """Handle every queued input event.
+
+        Consecutive swipes in the same direction are coalesced, for
+        example, if the user swipes several times while an application is
+        drawing then only one swipe is delivered.
+
+        :return: True if the button was pressed.
+        """
+        events = self._events
+        event = self._event
+        pressed = False
+        while events.get(event):
+            kind = event[0]
+            if kind == _BUTTON:
+                state = self._button.get_event(event[1])
+                if state is not None:
+                    pressed = pressed or bool(state)
+                    if self.sleep_at:
+                        self._handle_button(state)
+            elif self.sleep_at:
+                if kind != EventType.TOUCH and kind == events.peek():
+                    continue
+                self._handle_touch(event)
+        return pressed
+
     def _handle_button(self, state):
         """Process a button-press (or unpress) event.
         """
@@ -429,7 +819,7 @@ class Manager():
             if bool(event_mask & EventMask.NEXT) and not self.app.swipe(event):
                 # The app has already handled this one (mark as no event)
                 event[0] = 0
-            elif self.app == self.quick_ring[0] and len(self.notifications):
+            elif self._entry == self.quick_ring[0] and len(self.notifications):
                 event[0] = EventType.DOWN
             elif self.app == self.notifier:
                 event[0] = EventType.UP
@@ -449,6 +839,85 @@ class Manager():
 
         watch.touch.reset_touch_data()
 
+    def next_deadline(self):
+        """Work out when the system manager next needs to run.
+
+        The deadline is the earliest of the next application tick, the
+        next alarm and the time the watch goes to sleep. When the watch is
+        asleep the manager must still poll the charger (once a second) and,
+        if an ambient watch face is showing, wake at the start of the next
+        minute. Touch and button events can wake the manager sooner.
+
+        :returns: Deadline, as an uptime in milliseconds (see
+                  ``watch.rtc.get_uptime_ms()``)
+        """
+        rtc = watch.rtc
+        now = rtc.get_uptime_ms()
+
+        # Events that have not been handled yet are due immediately
+        if self._button.pending() or self._events.peek() is not None:
+            return now
+
+        # Wall times are converted to uptimes using the current second
+        # (the RTC advances both together)
+        second = now // 1000 - int(rtc.time())
+        deadline = None
+
+        alarms = self._alarms
+        if alarms:
+            deadline = (second + int(alarms[0][0])) * 1000
+
+        if self.sleep_at:
+            if self.tick_expiry:
+                deadline = _earliest(deadline, self.tick_expiry)
+            deadline = _earliest(deadline, (self.sleep_at + 1) * 1000)
+        else:
+            deadline = _earliest(deadline, now + _POLL_MS)
+            if self._ambient is not None:
+                minute = (int(rtc.time()) // 60 + 1) * 60
+                deadline = _earliest(deadline, (second + minute) * 1000)
+
+        return deadline
+
+    def _sleep(self):
+        """Sleep until the next deadline (or until an interrupt).
+
+        The deadline is published as ``watch.deadline`` so that boards
+        that can do so can avoid waking until there is work to do.
+        Currently only the simulator honours the deadline. On the nRF52
+        boards ``machine.deepsleep()`` returns at the next RTC interrupt,
+        every 125ms, whatever the deadline, and the manager simply goes back
+        to sleep if there is nothing to do.
+        """
+        watch.deadline = self.next_deadline()
+        machine.deepsleep()
+
+    def _run_alarms(self, now):
+        """Run every alarm that has expired.
+
+        Alarms queued by the actions themselves are left for the next tick
+        (even if they have already expired).
+        """
+        alarms = self._alarms
+        seq = self._alarm_seq
+        deferred = None
+        while alarms and alarms[0][0] <= now:
+            alarm = _heappop(alarms)
+            action = alarm[2]
+            if action is None:
+                self._alarm_cancelled -= 1
+            elif alarm[1] >= seq:
+                if deferred is None:
+                    deferred = []
+                deferred.append(alarm)
+            else:
+                alarm[2] = None
+                action()
+
+        if deferred:
+            for alarm in deferred:
+                _heappush(alarms, alarm)
+
     @micropython.native
     def _tick(self):
         """Handle the system tick.
@@ -461,13 +930,8 @@ class Manager():
         update = rtc.update()
 
         alarms = self._alarms
-        if update and alarms:
-            now = rtc.time()
-            head = alarms[0]
-
-            if head[0] <= now:
-                alarms.remove(head)
-                head[1]()
+        if update and alarms and alarms[0][0] <= rtc.time():
+            self._run_alarms(rtc.time())
 
         if self.sleep_at:
             if update and self.tick_expiry:
@@ -480,20 +944,23 @@ class Manager():
                         ticks += 1
                     self.app.tick(ticks)
 
+            self._handle_events()
             state = self._button.get_event()
             if None != state:
                 self._handle_button(state)
 
-            event = watch.touch.get_event()
-            if event:
-                self._handle_touch(event)
-
             if self.sleep_at and watch.rtc.uptime > self.sleep_at:
                 self.sleep()
-
-            gc.collect()
+            else:
+                self.gc.tick()
         else:
-            if 1 == self._button.get_event() or \
+            if update and self._ambient is not None:
+                minute = rtc.time() // 60
+                if minute != self._ambient:
+                    self._ambient = minute
+                    self._update_ambient()
+
+            if self._handle_events() or 1 == self._button.get_event() or \
                     self._charging != watch.battery.charging():
                 self.wake()
 
@@ -519,7 +986,7 @@ class Manager():
             # below
             while True:
                 self._tick()
-                machine.deepsleep()
+                self._sleep()
 
         while True:
             try:
@@ -527,6 +994,7 @@ class Manager():
             except KeyboardInterrupt:
                 raise
             except MemoryError:
+                self.gc.low_memory()
                 self.switch(PagerApp("Your watch is low on memory.\n\nYou may want to reboot."))
             except Exception as e:
                 # Only print the exception if the watch provides a way to do so!
@@ -534,17 +1002,16 @@ class Manager():
                     watch.print_exception(e)
                 self.switch(CrashApp(e))
 
-            # Currently there is no code to control how fast the system
-            # ticks. In other words this code will break if we improve the
-            # power management... we are currently relying on not being able
-            # to stay in the low-power state for very long.
-            machine.deepsleep()
+            # Sleep until there is something to do (or an interrupt wakes
+            # us)
+            self._sleep()
 
     def _work(self):
         self._scheduled = False
         try:
             self._tick()
         except MemoryError:
+            self.gc.low_memory()
             self.switch(PagerApp("Your watch is low on memory.\n\nYou may want to reboot."))
         except Exception as e:
             # Only print the exception if the watch provides a way to do so!
@@ -40,7 +40,7 @@ class BatteryMeter:
         if watch.battery.charging():
             if self.level != -1:
                 draw.blit(icon, 239-icon[1], 0,
-                             fg=wasp.system.theme('battery'))
+                             fg=wasp.system.theme('battery'), cache=True)
                 self.level = -1
         else:
             level = watch.battery.level()
@@ -57,10 +57,10 @@ class BatteryMeter:
             if self.level < 0 or ((level > 5) ^ (self.level > 5)):
                 if level  > 5:
                     draw.blit(icon, 239-icon[1], 0,
-                             fg=wasp.system.theme('battery'))
+                             fg=wasp.system.theme('battery'), cache=True)
                 else:
                     rgb = 0xf800
-                    draw.blit(icon, 239-icon[1], 0, fg=0xf800)
+                    draw.blit(icon, 239-icon[1], 0, fg=0xf800, cache=True)
 
             w = icon[1] - 10
             x = 239 - 5 - w
@@ -137,15 +137,16 @@ class NotificationBar:
         (x, y) = self._pos
 
         if wasp.watch.connected():
-            draw.blit(icons.blestatus, x, y, fg=wasp.system.theme('ble'))
+            draw.blit(icons.blestatus, x, y, fg=wasp.system.theme('ble'),
+                      cache=True)
             if wasp.system.notifications:
                 draw.blit(icons.notification, x+22, y,
-                          fg=wasp.system.theme('notify-icon'))
+                          fg=wasp.system.theme('notify-icon'), cache=True)
             else:
                 draw.fill(0, x+22, y, 30, 32)
         elif wasp.system.notifications:
             draw.blit(icons.notification, x, y,
-                      fg=wasp.system.theme('notify-icon'))
+                      fg=wasp.system.theme('notify-icon'), cache=True)
             draw.fill(0, x+30, y, 22, 32)
         else:
             draw.fill(0, x, y, 52, 32)
@@ -211,9 +212,11 @@ class ScrollIndicator:
         color = wasp.system.theme('scroll-indicator')
 
         if self.up:
-            draw.blit(icons.up_arrow, self._pos[0], self._pos[1], fg=color)
+            draw.blit(icons.up_arrow, self._pos[0], self._pos[1], fg=color,
+                      cache=True)
         if self.down:
-            draw.blit(icons.down_arrow, self._pos[0], self._pos[1]+13, fg=color)
+            draw.blit(icons.down_arrow, self._pos[0], self._pos[1]+13,
+                      fg=color, cache=True)
 
 class Button():
     """A button with a text label."""